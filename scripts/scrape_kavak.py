@@ -5,7 +5,7 @@ Kavak Website Scraper
 import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
-import json
+import orjson
 import os
 import time
 
@@ -210,8 +210,8 @@ class KavakWebScraper:
             # Ensure directory exists
             os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.scraped_content, f, ensure_ascii=False, indent=2)
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(self.scraped_content, option=orjson.OPT_INDENT_2))
 
             logger.info(f"Saved {len(self.scraped_content)} pages to {filename}")
 
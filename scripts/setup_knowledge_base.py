@@ -2,6 +2,7 @@
 Enhanced Kavak Knowledge Setup
 """
 
+import hashlib
 import json
 import os
 import logging
@@ -10,10 +11,11 @@ import datetime
 import uuid
 
 import chromadb
-from chromadb.utils import embedding_functions
+import orjson
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from src.config import settings
+from src.knowledge.kavak_knowledge import get_embedding_function
 from scrape_kavak import (
     KavakWebScraper,
 )
@@ -62,6 +64,16 @@ def _ensure_metadata_types(metadata: Dict[str, Any]) -> Dict[str, Any]:
     return compatible_metadata
 
 
+def _content_hash(
+    model_name: str, docs: List[str], metadatas: List[Dict], ids: List[str]
+) -> str:
+    """Fingerprint the chunked corpus and embedding model used to build it."""
+    payload = orjson.dumps(
+        [model_name, docs, metadatas, ids], option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
 def create_comprehensive_kavak_knowledge() -> List[Dict]:
     """
     Create comprehensive Kavak knowledge base
@@ -149,8 +161,8 @@ def setup_kavak_knowledge_base():
         knowledge_entries = create_comprehensive_kavak_knowledge()
 
     try:
-        with open(knowledge_data_json_path, "w", encoding="utf-8") as f:
-            json.dump(knowledge_entries, f, ensure_ascii=False, indent=2)
+        with open(knowledge_data_json_path, "wb") as f:
+            f.write(orjson.dumps(knowledge_entries, option=orjson.OPT_INDENT_2))
         logger.info(f"Raw knowledge data saved to {knowledge_data_json_path}")
     except Exception as e:
         logger.error(f"Error saving raw knowledge data to JSON: {e}")
@@ -159,6 +171,68 @@ def setup_kavak_knowledge_base():
         logger.error("No knowledge entries to load. Aborting.")
         return
 
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        length_function=len,
+        add_start_index=True,
+    )
+
+    all_chunk_docs = []
+    all_chunk_metadatas = []
+    all_chunk_ids = []
+    # Whitespace-normalized chunk texts already queued; the same paragraph
+    # often appears in both main_content and paragraphs
+    seen_chunk_texts = set()
+    duplicate_chunks = 0
+
+    logger.info(
+        f"Processing {len(knowledge_entries)} entries for chunking and embedding..."
+    )
+    for i, item in enumerate(knowledge_entries):
+        combined_text = _combine_text_fields(item)
+        if not combined_text:
+            logger.warning(
+                f"Skipping entry {i + 1} ('{item.get('title', 'N/A')}') due to empty combined text."
+            )
+            continue
+
+        chunks = text_splitter.split_text(combined_text)
+        # Stable IDs keep the content hash (and Chroma IDs) identical across runs
+        original_doc_id = item.get("id") or str(
+            uuid.uuid5(uuid.NAMESPACE_URL, item.get("url") or combined_text)
+        )
+
+        for chunk_idx, chunk_text in enumerate(chunks):
+            normalized_text = " ".join(chunk_text.split())
+            if normalized_text in seen_chunk_texts:
+                duplicate_chunks += 1
+                continue
+            seen_chunk_texts.add(normalized_text)
+
+            chunk_id = f"doc_{original_doc_id}_chunk_{chunk_idx}"
+
+            chunk_metadata = item.get("metadata", {}).copy()
+            chunk_metadata["original_title"] = item.get("title", "N/A")
+            chunk_metadata["original_url"] = item.get("url", "N/A")
+            chunk_metadata["original_doc_id"] = original_doc_id
+            chunk_metadata["chunk_number"] = chunk_idx + 1
+            chunk_metadata["total_chunks_in_doc"] = len(chunks)
+
+            all_chunk_docs.append(chunk_text)
+            all_chunk_metadatas.append(_ensure_metadata_types(chunk_metadata))
+            all_chunk_ids.append(chunk_id)
+
+    if duplicate_chunks:
+        logger.info(f"Skipped {duplicate_chunks} duplicate chunks.")
+
+    content_hash = _content_hash(
+        f"{settings.chroma.EMBEDDING_MODEL_NAME}:{settings.chroma.EMBEDDING_BACKEND}",
+        all_chunk_docs,
+        all_chunk_metadatas,
+        all_chunk_ids,
+    )
+
     logger.info("Setting up ChromaDB...")
     try:
         client = chromadb.HttpClient(
@@ -180,22 +254,37 @@ def setup_kavak_knowledge_base():
             f"Using persistent ChromaDB at: {os.path.abspath(chroma_persist_dir)}"
         )
 
-    embedding_func = embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name=settings.chroma.EMBEDDING_MODEL_NAME
-    )
-    logger.info(f"Embedding model: {settings.chroma.EMBEDDING_MODEL_NAME}")
-
     collection_name = settings.chroma.CHROMA_COLLECTION_NAME
     try:
         if any(c.name == collection_name for c in client.list_collections()):
+            existing = client.get_collection(name=collection_name)
+            if (existing.metadata or {}).get(
+                "content_hash"
+            ) == content_hash and existing.count() == len(all_chunk_docs):
+                logger.info(
+                    f"Collection '{collection_name}' is up to date "
+                    f"(content hash {content_hash[:12]}). Skipping rebuild."
+                )
+                return
             logger.warning(
                 f"Collection '{collection_name}' exists. Deleting for fresh build."
             )
             client.delete_collection(name=collection_name)
+
+        # Same factory (and backend) the app uses to embed queries
+        embedding_func = get_embedding_function(
+            settings.chroma.EMBEDDING_MODEL_NAME,
+            settings.chroma.EMBEDDING_BACKEND,
+            settings.chroma.EMBEDDING_ONNX_FILE,
+        )
+        logger.info(
+            f"Embedding model: {settings.chroma.EMBEDDING_MODEL_NAME} "
+            f"({settings.chroma.EMBEDDING_BACKEND})"
+        )
         collection = client.create_collection(
             name=collection_name,
             embedding_function=embedding_func,
-            metadata={"hnsw:space": "cosine"},
+            metadata={"hnsw:space": "cosine", "content_hash": content_hash},
         )
         logger.info(f"Collection '{collection_name}' created/recreated.")
     except Exception as e:
@@ -204,53 +293,22 @@ def setup_kavak_knowledge_base():
         )
         return
 
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
-        length_function=len,
-        add_start_index=True,
-    )
-
-    all_chunk_docs = []
-    all_chunk_metadatas = []
-    all_chunk_ids = []
-
-    logger.info(
-        f"Processing {len(knowledge_entries)} entries for chunking and embedding..."
-    )
-    for i, item in enumerate(knowledge_entries):
-        combined_text = _combine_text_fields(item)
-        if not combined_text:
-            logger.warning(
-                f"Skipping entry {i + 1} ('{item.get('title', 'N/A')}') due to empty combined text."
-            )
-            continue
-
-        chunks = text_splitter.split_text(combined_text)
-        original_doc_id = item.get("id", str(uuid.uuid4()))
-
-        for chunk_idx, chunk_text in enumerate(chunks):
-            chunk_id = f"doc_{original_doc_id}_chunk_{chunk_idx}"
-
-            chunk_metadata = item.get("metadata", {}).copy()
-            chunk_metadata["original_title"] = item.get("title", "N/A")
-            chunk_metadata["original_url"] = item.get("url", "N/A")
-            chunk_metadata["original_doc_id"] = original_doc_id
-            chunk_metadata["chunk_number"] = chunk_idx + 1
-            chunk_metadata["total_chunks_in_doc"] = len(chunks)
-
-            all_chunk_docs.append(chunk_text)
-            all_chunk_metadatas.append(_ensure_metadata_types(chunk_metadata))
-            all_chunk_ids.append(chunk_id)
-
     if all_chunk_docs:
         logger.info(
             f"Adding {len(all_chunk_docs)} text chunks to ChromaDB collection '{collection_name}'..."
         )
-        # Using large list, but can use batch_size if needed.
-        collection.add(
-            documents=all_chunk_docs, metadatas=all_chunk_metadatas, ids=all_chunk_ids
-        )
+        # Embed the whole corpus in one call (sentence-transformers sorts by
+        # length and pads per batch), then upload in server-sized slices.
+        all_chunk_embeddings = embedding_func(all_chunk_docs)
+        max_batch_size = client.get_max_batch_size()
+        for start in range(0, len(all_chunk_docs), max_batch_size):
+            end = start + max_batch_size
+            collection.add(
+                documents=all_chunk_docs[start:end],
+                metadatas=all_chunk_metadatas[start:end],
+                ids=all_chunk_ids[start:end],
+                embeddings=all_chunk_embeddings[start:end],
+            )
         logger.info(f"Successfully added {collection.count()} chunks to ChromaDB.")
     else:
         logger.warning("No valid text chunks to add to ChromaDB.")
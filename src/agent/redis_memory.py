@@ -3,10 +3,10 @@ Redis-based conversation memory system for Kavak AI Agent.
 Provides persistent storage for conversation history with TTL support.
 """
 
-import json
 import time
 from typing import Dict, List, Any
 
+import orjson
 import redis
 from redis.exceptions import RedisError
 
@@ -101,15 +101,18 @@ class RedisConversationMemory:
             if len(conversation_history) > max_turns:
                 conversation_history = conversation_history[-max_turns:]
 
-            # Serialize conversation history
+            # Serialize conversation history (orjson emits UTF-8 bytes directly)
             key = self.get_conversation_key(session_id)
-            serialized_data = json.dumps(conversation_history)
-
-            # Save to Redis with TTL
-            self.redis_client.setex(key, self.ttl_seconds, serialized_data)
-
-            # Update last activity timestamp
-            self.update_session_activity(session_id)
+            serialized_data = orjson.dumps(conversation_history)
+
+            # Save conversation and last activity timestamp with TTL in a
+            # single round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(key, self.ttl_seconds, serialized_data)
+            pipe.setex(
+                f"kavak:activity:{session_id}", self.ttl_seconds, int(time.time())
+            )
+            pipe.execute()
 
             logger.debug(
                 f"Saved conversation for session {session_id} ({len(conversation_history)} turns)"
@@ -147,7 +150,7 @@ class RedisConversationMemory:
                 return []
 
             # Deserialize conversation history
-            conversation_history = json.loads(serialized_data)
+            conversation_history = orjson.loads(serialized_data)
 
             # Update last activity timestamp
             self.update_session_activity(session_id)
@@ -160,7 +163,7 @@ class RedisConversationMemory:
         except RedisError as e:
             logger.error(f"Redis error retrieving conversation: {str(e)}")
             return []
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"JSON decode error for session {session_id}: {str(e)}")
             return []
         except Exception as e:
@@ -227,30 +230,42 @@ class RedisConversationMemory:
             return {}
 
         try:
-            # Get all conversation keys
+            # Iterate conversation keys incrementally; KEYS blocks the server
             conversation_pattern = "kavak:conversation:*"
-            all_keys = self.redis_client.keys(conversation_pattern)
+            session_ids = [
+                key.split(":", 2)[2]
+                for key in self.redis_client.scan_iter(
+                    match=conversation_pattern, count=100
+                )
+            ]
+            if not session_ids:
+                return {}
+
+            # Fetch conversation, TTL and last activity for every session in
+            # one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            for session_id in session_ids:
+                key = self.get_conversation_key(session_id)
+                pipe.get(key)
+                pipe.ttl(key)
+                pipe.get(f"kavak:activity:{session_id}")
+            replies = pipe.execute()
 
             result = {}
-            for key in all_keys:
-                # Extract session ID from key
-                session_id = key.split(":", 2)[2]
-
-                # Get conversation data
-                conversation_data = self.get_conversation(session_id)
-
-                # Get TTL
-                ttl = self.redis_client.ttl(key)
-
-                # Get last activity timestamp
-                activity_key = f"kavak:activity:{session_id}"
-                last_activity = self.redis_client.get(activity_key) or "0"
+            for index, session_id in enumerate(session_ids):
+                serialized_data, ttl, last_activity = replies[index * 3 : index * 3 + 3]
+                try:
+                    conversation_data = (
+                        orjson.loads(serialized_data) if serialized_data else []
+                    )
+                except orjson.JSONDecodeError:
+                    conversation_data = []
 
                 # Add session metadata
                 result[session_id] = {
                     "message_count": len(conversation_data),
                     "ttl_seconds": ttl,
-                    "last_activity": int(last_activity),
+                    "last_activity": int(last_activity or 0),
                     "last_message": conversation_data[-1]["user"]
                     if conversation_data
                     else "",
@@ -3,7 +3,7 @@ Configuration settings for Kavak AI Agent
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -57,6 +57,27 @@ class ChromaDBSettings(BaseSettings):
     CHROMA_PERSIST_DIRECTORY: str = "data/chroma_db"
     CHROMA_COLLECTION_NAME: str = "kavak_documents"
     EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    # "torch" (FP32) or "onnx"; ONNX needs the `onnx` extra installed
+    EMBEDDING_BACKEND: str = "torch"
+    EMBEDDING_ONNX_FILE: str = "onnx/model_qint8_avx512_vnni.onnx"
+    # Optional cross-encoder that reorders RERANKER_CANDIDATES dense hits
+    RERANKER_ENABLED: bool = False
+    RERANKER_MODEL_NAME: str = "BAAI/bge-reranker-v2-m3"
+    RERANKER_CANDIDATES: int = 20
+
+
+class CORSSettings(BaseSettings):
+    """CORS configuration settings"""
+
+    ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
+    ALLOWED_METHODS: List[str] = ["GET", "POST"]
+    ALLOWED_HEADERS: List[str] = ["Authorization", "Content-Type"]
+
+
+class SecuritySettings(BaseSettings):
+    """Trusted host configuration settings"""
+
+    ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1"]
 
 
 class Settings(BaseSettings):
@@ -76,6 +97,10 @@ class Settings(BaseSettings):
     redis: RedisSettings = Field(default_factory=RedisSettings)
     chroma: ChromaDBSettings = Field(default_factory=ChromaDBSettings)
 
+    # HTTP Security
+    cors: CORSSettings = Field(default_factory=CORSSettings)
+    security: SecuritySettings = Field(default_factory=SecuritySettings)
+
     # Agent Configuration
     AGENT_LANGUAGE: str = "es_MX"
     MAX_CONVERSATION_TURNS: int = 10
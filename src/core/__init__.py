@@ -1,7 +1,7 @@
 """Core functionality for the Kavak AI Sales Agent."""
 
 from .exceptions import setup_exception_handlers
-from .logging import get_logger, log, setup_logging
+from .logging import get_logger, setup_logging
 from .middleware import setup_middleware, setup_middlewares
 
 __all__ = [
@@ -10,5 +10,4 @@ __all__ = [
     "setup_middlewares",
     "setup_logging",
     "get_logger",
-    "log",
 ]
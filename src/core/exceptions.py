@@ -2,11 +2,11 @@
 Custom exception handlers for the API.
 """
 
+from secrets import token_hex
 from typing import Any, Dict
-from uuid import uuid4
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from src.core.logging import get_logger
 
@@ -17,15 +17,16 @@ logger = get_logger(__name__)
 def get_client_info(request: Request) -> Dict[str, Any]:
     """Extract client information from request."""
     client = request.client
+    headers = request.headers
     return {
         "client_host": client.host if client else None,
         "client_port": client.port if client else None,
-        "user_agent": request.headers.get("user-agent"),
-        "referer": request.headers.get("referer"),
+        "user_agent": headers.get("user-agent"),
+        "referer": headers.get("referer"),
     }
 
 
-async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def generic_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """
     Handle all unhandled exceptions with detailed logging.
 
@@ -34,28 +35,31 @@ async def generic_exception_handler(request: Request, exc: Exception) -> JSONRes
         exc: The exception that was raised.
 
     Returns:
-        JSONResponse: A JSON response with error details.
+        ORJSONResponse: A JSON response with error details.
     """
     # Generate unique error ID
-    error_id = str(uuid4())[:8]
+    error_id = token_hex(4)
 
     # Prepare error context
+    query_params = request.query_params
     error_context = {
         "error_id": error_id,
         "path": request.url.path,
         "method": request.method,
-        "query_params": dict(request.query_params),
+        "query_params": dict(query_params) if query_params else {},
         **get_client_info(request),
     }
 
     # Log the error with context
     logger.error(
-        f"Unhandled exception: {str(exc) or type(exc).__name__} - Context: {error_context}",
+        "Unhandled exception: %s - Context: %s",
+        str(exc) or type(exc).__name__,
+        error_context,
         exc_info=True,
     )
 
     # Return generic error response
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Ha ocurrido un error interno",
@@ -69,6 +73,9 @@ def setup_exception_handlers(app):
     """
     Add exception handlers to the FastAPI app.
 
+    The app itself is created with `default_response_class=ORJSONResponse`,
+    so handlers registered here should return `ORJSONResponse` as well.
+
     Args:
         app: The FastAPI application instance.
 
@@ -82,7 +89,7 @@ def setup_exception_handlers(app):
     # @app.exception_handler(ValueError)
     # async def value_error_handler(request: Request, exc: ValueError):
     #     logger.warning(f"Value error: {str(exc)}")
-    #     return JSONResponse(
+    #     return ORJSONResponse(
     #         status_code=400,
     #         content={"detail": str(exc)},
     #     )
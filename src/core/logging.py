@@ -15,6 +15,12 @@ from pathlib import Path
 
 from src.config import settings
 
+# The log format never uses thread/process fields, so skip collecting them
+# for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 # Global flag to track if logging is initialized
 _logging_initialized = False
 
@@ -80,21 +86,19 @@ def setup_logging() -> None:
         logger.addHandler(file_handler)
 
         # Configure log levels for external libraries to reduce noise
-        logging.getLogger("httpx").setLevel(logging.WARNING)
-        logging.getLogger("openai").setLevel(logging.WARNING)
-        logging.getLogger("urllib3").setLevel(logging.WARNING)
-        logging.getLogger("asyncio").setLevel(logging.WARNING)
+        for noisy_logger in ("httpx", "openai", "urllib3", "asyncio"):
+            logging.getLogger(noisy_logger).setLevel(logging.WARNING)
 
         logger.info("Logging configured successfully")
-        logger.info(f"Log file: {log_path.absolute()}")
-        logger.debug(f"Log level set to: {log_config.LOG_LEVEL}")
+        logger.info("Log file: %s", log_path.absolute())
+        logger.debug("Log level set to: %s", log_config.LOG_LEVEL)
 
         _logging_initialized = True
 
     except Exception as e:
         # If we can't set up file logging, at least log to console
         logging.basicConfig(level=logging.INFO)
-        logging.error(f"Failed to configure logging: {e}")
+        logging.error("Failed to configure logging: %s", e)
         logging.error("Falling back to basic console logging")
         _logging_initialized = (
             True  # Still mark as initialized to prevent repeated errors
@@ -105,8 +109,8 @@ def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the given name.
 
-    This function ensures that logging is configured before returning a logger.
-    It's safe to call this at module level.
+    Handlers are not configured here, so it is safe to call at module level;
+    `setup_logging` runs once from the application lifespan.
 
     Args:
         name: Name of the logger (usually __name__)
@@ -114,12 +118,4 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         Configured logger instance
     """
-    setup_logging()  # Ensure logging is configured
     return logging.getLogger(name)
-
-
-# Create a default logger that can be imported and used directly
-log = get_logger(__name__)
-
-# Initialize logging when this module is imported
-setup_logging()
@@ -2,9 +2,131 @@
 Application middlewares for the FastAPI application.
 """
 
+from typing import Iterable, List, Optional, Tuple
+
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+Headers = List[Tuple[bytes, bytes]]
+
+CORS_MAX_AGE = 600
+
+
+class FastCORSMiddleware:
+    """
+    Minimal pure-ASGI CORS middleware.
+
+    Header values are encoded once at startup. Simple requests only get
+    headers appended to ``http.response.start`` and preflight requests are
+    answered without reaching the application.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Iterable[str],
+        allow_methods: Iterable[str],
+        allow_headers: Iterable[str],
+        allow_credentials: bool = True,
+    ) -> None:
+        self.app = app
+        origins = frozenset(allow_origins)
+        methods = [method.upper() for method in allow_methods]
+        headers = [header.lower() for header in allow_headers]
+
+        self.allow_all_origins = "*" in origins
+        self.allow_all_methods = "*" in methods
+        self.allow_all_headers = "*" in headers
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in origins)
+        self.allow_methods = frozenset(method.encode("latin-1") for method in methods)
+
+        self.simple_headers: Headers = [(b"vary", b"Origin")]
+        if allow_credentials:
+            self.simple_headers.append((b"access-control-allow-credentials", b"true"))
+        self.preflight_headers: Headers = [
+            *self.simple_headers,
+            (b"access-control-max-age", str(CORS_MAX_AGE).encode("latin-1")),
+        ]
+        if not self.allow_all_methods:
+            self.preflight_headers.append(
+                (b"access-control-allow-methods", ", ".join(methods).encode("latin-1"))
+            )
+        if not self.allow_all_headers:
+            self.preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(headers).encode("latin-1"))
+            )
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        """Check an ``Origin`` header value against the allowlist."""
+        return self.allow_all_origins or origin in self.allow_origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self.preflight_response(origin, request_method, request_headers, send)
+            return
+
+        if not self.is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin), *self.simple_headers]
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight_response(
+        self,
+        origin: bytes,
+        request_method: bytes,
+        request_headers: Optional[bytes],
+        send: Send,
+    ) -> None:
+        """Answer a CORS preflight request directly."""
+        headers = [*self.preflight_headers]
+        if self.is_allowed_origin(origin):
+            headers.append((b"access-control-allow-origin", origin))
+            if self.allow_all_methods or request_method in self.allow_methods:
+                status_code, body = 200, b"OK"
+            else:
+                status_code, body = 400, b"Disallowed CORS method"
+        else:
+            status_code, body = 400, b"Disallowed CORS origin"
+
+        if self.allow_all_methods:
+            headers.append((b"access-control-allow-methods", request_method))
+        if self.allow_all_headers and request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send(
+            {"type": "http.response.start", "status": status_code, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
 
 
 def setup_middleware(app: FastAPI) -> FastAPI:
@@ -17,19 +139,29 @@ def setup_middleware(app: FastAPI) -> FastAPI:
     Returns:
         FastAPI: Configured FastAPI application
     """
-    # CORS Middleware (in production, replace with actual config)
+    # Wildcards are only allowed outside production; in production origins
+    # are matched against the explicit allowlists by set membership.
+    if settings.is_production:
+        allow_origins = settings.cors.ALLOWED_ORIGINS
+        allow_methods = settings.cors.ALLOWED_METHODS
+        allow_headers = settings.cors.ALLOWED_HEADERS
+        allowed_hosts = settings.security.ALLOWED_HOSTS
+    else:
+        allow_origins = allow_methods = allow_headers = allowed_hosts = ["*"]
+
+    # CORS Middleware
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
+        FastCORSMiddleware,
+        allow_origins=allow_origins,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=allow_methods,
+        allow_headers=allow_headers,
     )
 
-    # Trusted Host Middleware (in production, replace with actual config)
+    # Trusted Host Middleware
     app.add_middleware(
         TrustedHostMiddleware,
-        allowed_hosts=["*"],
+        allowed_hosts=allowed_hosts,
     )
 
     return app
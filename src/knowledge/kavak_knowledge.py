@@ -3,19 +3,83 @@ Kavak Knowledge Base - RAG Implementation
 Connects to a pre-populated ChromaDB instance.
 """
 
-from typing import Dict, List, Optional
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from itertools import repeat
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 import chromadb
+import numpy as np
 from chromadb.api.models.Collection import Collection
 from chromadb.utils import embedding_functions
 
 from src.config import settings
 from src.core.logging import get_logger
 
+if TYPE_CHECKING:
+    from sentence_transformers import CrossEncoder
+
 logger = get_logger(__name__)
 
 # Global instance of the Knowledge Base
 kavak_kb_instance: Optional["KavakKnowledgeBase"] = None
+_kb_lock = threading.Lock()
+_akb_lock = asyncio.Lock()
+
+# Micro-batching window for concurrent async searches
+MAX_BATCH = 16
+MAX_WAIT_MS = 5.0
+
+# Number of query embeddings kept per knowledge base instance
+EMBEDDING_CACHE_SIZE = 4096
+
+# Number of unfiltered search results kept per knowledge base instance
+SEARCH_CACHE_SIZE = 1024
+
+# Seconds a cached search result is served before it is fetched again
+SEARCH_CACHE_TTL_S = 300.0
+
+# Result fields fetched from Chroma when the caller needs the full records
+FULL_INCLUDE = ("documents", "metadatas", "distances")
+
+# Minimum seconds between full tracebacks for recurring errors
+TRACEBACK_INTERVAL_S = 60.0
+
+# Query used to warm the models at startup
+WARMUP_QUERY = "kavak"
+
+
+@functools.lru_cache(maxsize=None)
+def get_embedding_function(
+    model_name: str, backend: str = "torch", onnx_file: Optional[str] = None
+) -> embedding_functions.SentenceTransformerEmbeddingFunction:
+    """Load the embedding model once per process and share it.
+
+    Weights are loaded from safetensors, which are memory-mapped read-only,
+    so forked workers share the page cache instead of private copies. With
+    the "onnx" backend the given (typically int8-quantized) ONNX export is
+    run through onnxruntime instead of FP32 torch.
+    """
+    if backend == "onnx":
+        return embedding_functions.SentenceTransformerEmbeddingFunction(
+            model_name=model_name,
+            backend="onnx",
+            model_kwargs={"file_name": onnx_file},
+        )
+    return embedding_functions.SentenceTransformerEmbeddingFunction(
+        model_name=model_name, model_kwargs={"use_safetensors": True}
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_reranker(model_name: str) -> "CrossEncoder":
+    """Load the cross-encoder reranker once per process and share it."""
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model_name)
 
 
 class KavakKnowledgeBase:
@@ -25,74 +89,161 @@ class KavakKnowledgeBase:
         self.chroma_port = settings.chroma.CHROMA_PORT
         self.collection_name = settings.chroma.CHROMA_COLLECTION_NAME
         self.embedding_model_name = settings.chroma.EMBEDDING_MODEL_NAME
+        self.embedding_backend = settings.chroma.EMBEDDING_BACKEND
+        self.reranker_model_name = (
+            settings.chroma.RERANKER_MODEL_NAME
+            if settings.chroma.RERANKER_ENABLED
+            else None
+        )
+        self.reranker_candidates = settings.chroma.RERANKER_CANDIDATES
 
         self.chroma_client: Optional[chromadb.ClientAPI] = None
         self.embedding_function: Optional[
             embedding_functions.SentenceTransformerEmbeddingFunction
         ] = None
         self.collection: Optional[Collection] = None
+        self.reranker: Optional["CrossEncoder"] = None
         self.initialization_error: Optional[str] = None
+        self._dispatcher = BatchedQueryDispatcher(self)
+        self._last_traceback_ts = float("-inf")
+        # Repeated user prompts skip the transformer forward pass entirely;
+        # misses are embedded together, one model call per batch
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        # Popular questions ("garantía", "financiamiento") repeat across sessions;
+        # entries expire after SEARCH_CACHE_TTL_S and are dropped when the
+        # collection's content_hash changes
+        self._search_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, List]]]" = (
+            OrderedDict()
+        )
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_hits = 0
+        self._search_cache_misses = 0
+        self._content_hash: Optional[str] = None
 
     def initialize(self) -> None:
         """Initialize connection to ChromaDB and get the collection."""
         logger.info(
-            f"Attempting to initialize KavakKnowledgeBase for collection: '{self.collection_name}'..."
+            "Attempting to initialize KavakKnowledgeBase for collection: '%s'...",
+            self.collection_name,
         )
         try:
-            # Attempt to connect to ChromaDB service
-            logger.info(
-                f"Connecting to ChromaDB server at http://{self.chroma_host}:{self.chroma_port}"
-            )
-            self.chroma_client = chromadb.HttpClient(
-                host=self.chroma_host, port=self.chroma_port
-            )
-            self.chroma_client.heartbeat()  # Test connection
-            logger.info(
-                f"Successfully connected to ChromaDB server: http://{self.chroma_host}:{self.chroma_port}"
-            )
+            self._connect()
+            self._load_embedding_function()
+            self._load_reranker()
+            self._load_collection()
+        except Exception as e:  # Catches errors connecting to ChromaDB service itself
+            self._handle_connection_error(e)
 
-            # Initialize embedding function
-            self.embedding_function = (
-                embedding_functions.SentenceTransformerEmbeddingFunction(
-                    model_name=self.embedding_model_name
-                )
+        self._log_initialization_status()
+
+    async def ainitialize(self) -> None:
+        """Async variant of `initialize`.
+
+        The ChromaDB connection check and the embedding model load run
+        concurrently in worker threads, so startup waits for the slower of the
+        two instead of their sum.
+        """
+        logger.info(
+            "Attempting to initialize KavakKnowledgeBase for collection: '%s'...",
+            self.collection_name,
+        )
+        try:
+            await asyncio.gather(
+                asyncio.to_thread(self._connect),
+                asyncio.to_thread(self._load_embedding_function),
+                asyncio.to_thread(self._load_reranker),
             )
-            logger.info(f"Using embedding model: {self.embedding_model_name}")
+            await asyncio.to_thread(self._load_collection)
+        except Exception as e:
+            self._handle_connection_error(e)
 
-            # Attempt to get the collection
-            try:
-                logger.info(f"Attempting to get collection: '{self.collection_name}'")
-                self.collection = self.chroma_client.get_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function,
+        await asyncio.to_thread(self._log_initialization_status)
+
+    def _connect(self) -> None:
+        """Create the ChromaDB client and verify the service responds."""
+        logger.info(
+            "Connecting to ChromaDB server at http://%s:%s",
+            self.chroma_host,
+            self.chroma_port,
+        )
+        self.chroma_client = chromadb.HttpClient(
+            host=self.chroma_host, port=self.chroma_port
+        )
+        self.chroma_client.heartbeat()  # Test connection
+        logger.info(
+            "Successfully connected to ChromaDB server: http://%s:%s",
+            self.chroma_host,
+            self.chroma_port,
+        )
+
+    def _load_embedding_function(self) -> None:
+        """Attach the shared embedding function for the configured model."""
+        self.embedding_function = get_embedding_function(
+            self.embedding_model_name,
+            self.embedding_backend,
+            settings.chroma.EMBEDDING_ONNX_FILE,
+        )
+        with self._embedding_cache_lock:
+            self._embedding_cache.clear()
+        self._clear_search_cache()
+        logger.info(
+            "Using embedding model: %s (%s)",
+            self.embedding_model_name,
+            self.embedding_backend,
+        )
+
+    def _load_reranker(self) -> None:
+        """Attach the shared cross-encoder reranker, if enabled."""
+        if not self.reranker_model_name:
+            return
+        self.reranker = get_reranker(self.reranker_model_name)
+        self._clear_search_cache()
+        logger.info(
+            "Reranking top %d candidates with: %s",
+            self.reranker_candidates,
+            self.reranker_model_name,
+        )
+
+    def _load_collection(self) -> None:
+        """Fetch the collection, recording a non-fatal error if it is missing."""
+        try:
+            logger.info("Attempting to get collection: '%s'", self.collection_name)
+            self.collection = self.chroma_client.get_collection(
+                name=self.collection_name,
+                embedding_function=self.embedding_function,
+            )
+            logger.info("Successfully got collection '%s'.", self.collection_name)
+            self._track_content_hash(self.collection)
+            collection_count = self.collection.count()
+            if collection_count == 0:
+                logger.warning(
+                    "Collection '%s' exists but is empty. RAG will be unavailable until data is added.",
+                    self.collection_name,
                 )
-                logger.info(f"Successfully got collection '{self.collection_name}'.")
-                collection_count = self.collection.count()
-                if collection_count == 0:
-                    logger.warning(
-                        f"Collection '{self.collection_name}' exists but is empty. RAG will be unavailable until data is added."
-                    )
-                else:
-                    logger.info(
-                        f"Collection '{self.collection_name}' contains {collection_count} documents."
-                    )
-            except (
-                Exception
-            ) as e:  # Handles collection not found and other get_collection errors
-                self.initialization_error = f"Failed to get ChromaDB collection '{self.collection_name}': {e}. This is expected if 'make setup-knowledge' has not been run. RAG will be unavailable."
-                logger.warning(self.initialization_error)  # Log as warning, not error
-                self.collection = (
-                    None  # Ensure collection is None if not found/accessible
+            else:
+                logger.info(
+                    "Collection '%s' contains %d documents.",
+                    self.collection_name,
+                    collection_count,
                 )
+        except (
+            Exception
+        ) as e:  # Handles collection not found and other get_collection errors
+            self.initialization_error = f"Failed to get ChromaDB collection '{self.collection_name}': {e}. This is expected if 'make setup-knowledge' has not been run. RAG will be unavailable."
+            logger.warning(self.initialization_error)  # Log as warning, not error
+            self.collection = None  # Ensure collection is None if not found/accessible
 
-        except Exception as e:  # Catches errors connecting to ChromaDB service itself
-            self.initialization_error = (
-                f"Critical error connecting to ChromaDB service: {e}"
-            )
-            logger.error(self.initialization_error, exc_info=True)
-            self.collection = None
+    def _handle_connection_error(self, e: Exception) -> None:
+        """Record a failure to reach the ChromaDB service."""
+        self.initialization_error = (
+            f"Critical error connecting to ChromaDB service: {e}"
+        )
+        self._log_error(logger.error, "%s", self.initialization_error)
+        self.collection = None
 
-        # Final status log (informative only)
+    def _log_initialization_status(self) -> None:
+        """Log the overall outcome of an initialization attempt."""
         if self.chroma_client:
             if self.collection and self.collection.count() > 0:
                 logger.info(
@@ -135,6 +286,7 @@ class KavakKnowledgeBase:
                 name=self.collection_name, embedding_function=self.embedding_function
             )
             self.collection = current_collection
+            self._track_content_hash(current_collection)
 
             collection_count = self.collection.count()
             if collection_count > 0:
@@ -144,13 +296,13 @@ class KavakKnowledgeBase:
                 self.initialization_error = (
                     f"Collection '{self.collection_name}' exists but is empty."
                 )
-                logger.warning(f"RAG Status: Not Ready. {self.initialization_error}")
+                logger.warning("RAG Status: Not Ready. %s", self.initialization_error)
                 return False
         except chromadb.errors.NotFoundError:
             self.initialization_error = (
                 f"Collection '{self.collection_name}' does not exist."
             )
-            logger.warning(f"RAG Status: Not Ready. {self.initialization_error}")
+            logger.warning("RAG Status: Not Ready. %s", self.initialization_error)
             self.collection = None
             return False
         except Exception as e:
@@ -158,13 +310,26 @@ class KavakKnowledgeBase:
             self.initialization_error = (
                 f"Failed to access or verify collection '{self.collection_name}': {e}"
             )
-            logger.error(
-                f"RAG Status: Not Ready. Unexpected error: {self.initialization_error}",
-                exc_info=True,
+            self._log_error(
+                logger.warning,
+                "RAG Status: Not Ready. Unexpected error: %s",
+                self.initialization_error,
             )
             self.collection = None
             return False
 
+    def warmup(self) -> None:
+        """Run one throwaway search so the first user skips model warm-up.
+
+        Exercises the embedding model, the Chroma connection and, if enabled,
+        the reranker.
+        """
+        if not self.is_ready:
+            return
+        start = time.perf_counter()
+        self.search_knowledge_arrays(WARMUP_QUERY, top_k=1)
+        logger.info("Knowledge base warmed up in %.2fs", time.perf_counter() - start)
+
     def search_knowledge(
         self, query: str, top_k: int = 3, filters: Optional[Dict] = None
     ) -> List[Dict]:
@@ -179,57 +344,417 @@ class KavakKnowledgeBase:
             A list of dictionaries containing document content, metadata, and distance,
             or an empty list if not ready or no results.
         """
+        return to_records(
+            self.search_knowledge_arrays(query, top_k, filters, include=FULL_INCLUDE)
+        )
+
+    def search_knowledge_arrays(
+        self,
+        query: str,
+        top_k: int = 3,
+        filters: Optional[Dict] = None,
+        include: Sequence[str] = ("documents",),
+    ) -> Dict[str, List]:
+        """Search the knowledge base and return results as parallel arrays.
+
+        Args:
+            query: The user's query string.
+            top_k: The number of top results to return.
+            filters: Optional dictionary for metadata filtering.
+            include: Result fields to fetch from Chroma. Defaults to document
+                text only; fields not requested come back as empty lists.
+
+        Returns:
+            A dict with "documents", "metadatas" and "distances" lists, all
+            empty if not ready or no results. Use `to_records` for the
+            per-document view.
+        """
+        include = tuple(include)
+        cache_key = None if filters else (_normalize_query(query), top_k, include)
+        if cache_key is not None:
+            cached = self._get_cached_search(cache_key)
+            if cached is not None:
+                return cached
+
         if not self.is_ready:
             logger.error(
-                f"Knowledge base search failed: {self.initialization_error or 'Unknown error'}"
+                "Knowledge base search failed: %s",
+                self.initialization_error or "Unknown error",
             )
-            return []
+            return _empty_arrays()
 
         try:
             logger.debug(
-                f"Searching collection '{self.collection_name}' for query: '{query}', top_k={top_k}, filters={filters}"
+                "Searching collection '%s' for query: '%s', top_k=%d, filters=%s",
+                self.collection_name,
+                query,
+                top_k,
+                filters,
             )
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=top_k,
-                where=filters if filters else None,
-                include=["documents", "metadatas", "distances"],
+            arrays = self._search(query, top_k, filters, include)
+            if cache_key is not None:
+                self._put_cached_search(cache_key, arrays)
+            return arrays
+
+        except Exception as e:
+            self._log_error(
+                logger.error,
+                "Error during knowledge search for query '%s': %s",
+                query,
+                e,
             )
+            return _empty_arrays()
 
-            formatted_results = []
-            if results and results.get("documents") and results.get("documents")[0]:
-                for i, doc_text in enumerate(results["documents"][0]):
-                    metadata = (
-                        results["metadatas"][0][i]
-                        if results.get("metadatas") and results["metadatas"][0]
-                        else {}
-                    )
-                    distance = (
-                        results["distances"][0][i]
-                        if results.get("distances") and results["distances"][0]
-                        else None
-                    )
-                    formatted_results.append(
-                        {
-                            "content": doc_text,
-                            "metadata": metadata,
-                            "distance": distance,
-                            "title": metadata.get("title", "N/A"),
-                            "source_url": metadata.get("source_url", "N/A"),
-                        }
-                    )
-                logger.debug(
-                    f"Found {len(formatted_results)} results for query: '{query}'"
-                )
+    def search_cache_info(self) -> functools._CacheInfo:
+        """Return hit/miss statistics of the search result cache."""
+        with self._search_cache_lock:
+            return functools._CacheInfo(
+                self._search_cache_hits,
+                self._search_cache_misses,
+                SEARCH_CACHE_SIZE,
+                len(self._search_cache),
+            )
+
+    def _get_cached_search(self, key: Tuple) -> Optional[Dict[str, List]]:
+        """Return a copy of a fresh cached search result, or None on a miss."""
+        now = time.monotonic()
+        with self._search_cache_lock:
+            entry = self._search_cache.get(key)
+            if entry is None or entry[0] <= now:
+                self._search_cache_misses += 1
+                return None
+            self._search_cache.move_to_end(key)
+            self._search_cache_hits += 1
+        # Hand out copies so callers cannot mutate the cached entry
+        return {field: list(values) for field, values in entry[1].items()}
+
+    def _put_cached_search(self, key: Tuple, arrays: Dict[str, List]) -> None:
+        """Store a search result, evicting the least recently used entries."""
+        entry = (
+            time.monotonic() + SEARCH_CACHE_TTL_S,
+            {field: list(values) for field, values in arrays.items()},
+        )
+        with self._search_cache_lock:
+            self._search_cache[key] = entry
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+
+    def _clear_search_cache(self) -> None:
+        """Drop every cached search result."""
+        with self._search_cache_lock:
+            self._search_cache.clear()
+
+    def _track_content_hash(self, collection: Collection) -> None:
+        """Clear cached results when the collection was rebuilt with new content."""
+        metadata = collection.metadata
+        content_hash = (
+            metadata.get("content_hash") if isinstance(metadata, dict) else None
+        )
+        if content_hash == self._content_hash:
+            return
+        if self._content_hash is not None:
+            logger.info("Knowledge base content changed; clearing search cache")
+        self._clear_search_cache()
+        self._content_hash = content_hash
+
+    def _search(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict],
+        include: Tuple[str, ...],
+    ) -> Dict[str, List]:
+        """Query the collection, reranking oversampled candidates if enabled."""
+        if self.reranker is None:
+            results = self._query_collection([query], top_k, filters, include)
+            return self._unpack_results(results, query)
+
+        # The cross-encoder scores document text, so always fetch it
+        fetch_include = tuple(dict.fromkeys(include + ("documents",)))
+        results = self._query_collection(
+            [query], max(top_k, self.reranker_candidates), filters, fetch_include
+        )
+        arrays = self._rerank(query, self._unpack_results(results, query), top_k)
+        if "documents" not in include:
+            arrays["documents"] = []
+        return arrays
+
+    def _rerank(
+        self, query: str, arrays: Dict[str, List], top_k: int
+    ) -> Dict[str, List]:
+        """Keep the top_k candidates by cross-encoder score, best first."""
+        documents = arrays["documents"]
+        if len(documents) <= 1:
+            return arrays
+        scores = self.reranker.predict([(query, doc) for doc in documents])
+        order = np.argsort(-np.asarray(scores), kind="stable")[:top_k]
+        return {
+            key: [values[i] for i in order] if values else values
+            for key, values in arrays.items()
+        }
+
+    async def asearch_knowledge(
+        self, query: str, top_k: int = 3, filters: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Async variant of `search_knowledge`."""
+        return to_records(
+            await self.asearch_knowledge_arrays(
+                query, top_k, filters, include=FULL_INCLUDE
+            )
+        )
+
+    async def asearch_knowledge_arrays(
+        self,
+        query: str,
+        top_k: int = 3,
+        filters: Optional[Dict] = None,
+        include: Sequence[str] = ("documents",),
+    ) -> Dict[str, List]:
+        """Async variant of `search_knowledge_arrays`.
+
+        Shares the search result cache with the sync path. Concurrent misses
+        are coalesced by a `BatchedQueryDispatcher` into a single
+        `collection.query` call, so K simultaneous searches cost one Chroma
+        round trip and one embedding batch instead of K.
+        """
+        include = tuple(include)
+        cache_key = None if filters else (_normalize_query(query), top_k, include)
+        if cache_key is not None:
+            cached = self._get_cached_search(cache_key)
+            if cached is not None:
+                return cached
+
+        if not await asyncio.to_thread(lambda: self.is_ready):
+            logger.error(
+                "Knowledge base search failed: %s",
+                self.initialization_error or "Unknown error",
+            )
+            return _empty_arrays()
+
+        try:
+            logger.debug(
+                "Queueing batched search on '%s' for query: '%s', top_k=%d, filters=%s",
+                self.collection_name,
+                query,
+                top_k,
+                filters,
+            )
+            if self.reranker is None:
+                results = await self._dispatcher.submit(query, top_k, filters, include)
+                arrays = self._unpack_results(results, query)
             else:
-                logger.debug(f"No results found for query: '{query}'")
-            return formatted_results
+                # The cross-encoder scores document text, so always fetch it
+                fetch_include = tuple(dict.fromkeys(include + ("documents",)))
+                results = await self._dispatcher.submit(
+                    query,
+                    max(top_k, self.reranker_candidates),
+                    filters,
+                    fetch_include,
+                )
+                arrays = await asyncio.to_thread(
+                    self._rerank, query, self._unpack_results(results, query), top_k
+                )
+                if "documents" not in include:
+                    arrays["documents"] = []
+            if cache_key is not None:
+                self._put_cached_search(cache_key, arrays)
+            return arrays
 
         except Exception as e:
-            logger.error(
-                f"Error during knowledge search for query '{query}': {e}", exc_info=True
+            self._log_error(
+                logger.error,
+                "Error during knowledge search for query '%s': %s",
+                query,
+                e,
             )
-            return []
+            return _empty_arrays()
+
+    def _log_error(self, log_method, msg: str, *args) -> None:
+        """Log an error, attaching the traceback at most once per interval.
+
+        Recurring failures (e.g. a flapping ChromaDB) would otherwise format
+        a full traceback on every call.
+        """
+        now = time.monotonic()
+        if now - self._last_traceback_ts >= TRACEBACK_INTERVAL_S:
+            self._last_traceback_ts = now
+            log_method(msg, *args, exc_info=True)
+        else:
+            log_method(msg, *args)
+
+    def _embed_queries(self, query_texts: List[str]) -> List[np.ndarray]:
+        """Embed queries, sending every cache miss through one model call."""
+        cache = self._embedding_cache
+        with self._embedding_cache_lock:
+            embeddings = {q: cache[q] for q in query_texts if q in cache}
+            for query in embeddings:
+                cache.move_to_end(query)
+
+        misses = [q for q in dict.fromkeys(query_texts) if q not in embeddings]
+        if misses:
+            computed = dict(zip(misses, self.embedding_function(misses)))
+            embeddings.update(computed)
+            with self._embedding_cache_lock:
+                cache.update(computed)
+                while len(cache) > EMBEDDING_CACHE_SIZE:
+                    cache.popitem(last=False)
+
+        return [embeddings[q] for q in query_texts]
+
+    def _query_collection(
+        self,
+        query_texts: List[str],
+        top_k: int,
+        filters: Optional[Dict],
+        include: Sequence[str] = FULL_INCLUDE,
+    ) -> Dict:
+        """Run a single (possibly multi-query) `collection.query` call."""
+        return self.collection.query(
+            query_embeddings=[e.tolist() for e in self._embed_queries(query_texts)],
+            n_results=top_k,
+            where=filters if filters else None,
+            include=list(include),
+        )
+
+    def _unpack_results(self, results: Dict, query: str) -> Dict[str, List]:
+        """Take the single-query row of a Chroma result as parallel arrays."""
+        arrays = {key: (results.get(key) or [[]])[0] or [] for key in FULL_INCLUDE}
+        if arrays["documents"]:
+            logger.debug(
+                "Found %d results for query: '%s'", len(arrays["documents"]), query
+            )
+        else:
+            logger.debug("No results found for query: '%s'", query)
+        return arrays
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse case and whitespace so equivalent queries share a cache entry.
+
+    Only the cache key is normalized; the original query is what gets embedded
+    and reranked, since cased models may score it differently.
+    """
+    return " ".join(query.lower().split())
+
+
+def _empty_arrays() -> Dict[str, List]:
+    """Return the parallel-array shape of an empty search result."""
+    return {"documents": [], "metadatas": [], "distances": []}
+
+
+def to_records(arrays: Dict[str, List]) -> List[Dict]:
+    """Build the per-document dict view of a `search_knowledge_arrays` result."""
+    documents = arrays.get("documents") or []
+    metadatas = arrays.get("metadatas") or repeat({})
+    distances = arrays.get("distances") or repeat(None)
+    return [
+        {
+            "content": doc_text,
+            "metadata": metadata,
+            "distance": distance,
+            "title": metadata.get("title", "N/A"),
+            "source_url": metadata.get("source_url", "N/A"),
+        }
+        for doc_text, metadata, distance in zip(documents, metadatas, distances)
+    ]
+
+
+class BatchedQueryDispatcher:
+    """Coalesces concurrent knowledge-base queries into batched Chroma calls.
+
+    Queries submitted within `max_wait_ms` of each other (up to `max_batch`)
+    are sent as one `collection.query` call for all k queries, and each
+    caller's future is resolved with its own slice of the result.
+    """
+
+    # Keys of a Chroma QueryResult that hold one entry per query text
+    _PER_QUERY_KEYS = ("ids", "documents", "metadatas", "distances")
+
+    def __init__(
+        self,
+        kb: "KavakKnowledgeBase",
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        self.kb = kb
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict] = None,
+        include: Sequence[str] = FULL_INCLUDE,
+    ) -> Dict:
+        """Queue a query and wait for its share of the batched result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and tasks are bound to the loop that created them
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+
+        future = loop.create_future()
+        self._queue.put_nowait((query, top_k, filters, tuple(include), future))
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._drain())
+        return await future
+
+    async def _drain(self) -> None:
+        """Collect queued queries into batches until the queue is empty."""
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple]) -> None:
+        """Send one `collection.query` per (top_k, filters, include) group."""
+        groups: Dict[Tuple[int, str, Tuple[str, ...]], List[Tuple]] = {}
+        for item in batch:
+            _, top_k, filters, include, _ = item
+            key = (top_k, repr(sorted(filters.items())) if filters else "", include)
+            groups.setdefault(key, []).append(item)
+
+        for items in groups.values():
+            query_texts = [item[0] for item in items]
+            _, top_k, filters, include, _ = items[0]
+            logger.debug(
+                "Dispatching batched knowledge query with %d queries", len(query_texts)
+            )
+            try:
+                results = await asyncio.to_thread(
+                    self.kb._query_collection, query_texts, top_k, filters, include
+                )
+            except Exception as e:
+                for *_, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for i, (*_, future) in enumerate(items):
+                if not future.done():
+                    future.set_result(
+                        {
+                            key: [results[key][i]]
+                            for key in self._PER_QUERY_KEYS
+                            if results.get(key) is not None
+                        }
+                    )
 
 
 # --- Global Instance Management ---
@@ -239,30 +764,60 @@ def initialize_global_kavak_kb():
     """Initializes the global Kavak Knowledge Base instance."""
     global kavak_kb_instance
     if kavak_kb_instance is None:
-        logger.info("Initializing Global Kavak Knowledge Base at startup...")
-        kavak_kb_instance = KavakKnowledgeBase()
-        kavak_kb_instance.initialize()
-        # We just log the overall outcome of the initialization attempt.
-        if kavak_kb_instance.initialization_error and not kavak_kb_instance.is_ready:
-            logger.warning(
-                f"Global Kavak Knowledge Base initialized, but RAG is not fully ready. Reason: {kavak_kb_instance.initialization_error}. The agent will attempt to function with limited/no RAG capabilities."
-            )
-        elif kavak_kb_instance.is_ready:
-            logger.info("Global Kavak Knowledge Base initialized and RAG is ready.")
-        else:  # Should ideally be caught, but as a fallback
-            logger.warning(
-                f"Global Kavak Knowledge Base initialized, but RAG is not ready. Status: {kavak_kb_instance.initialization_error or 'Unknown. Check KB logs.'}. The agent will attempt to function with limited/no RAG capabilities."
-            )
+        with _kb_lock:
+            if kavak_kb_instance is None:
+                logger.info("Initializing Global Kavak Knowledge Base at startup...")
+                kb = KavakKnowledgeBase()
+                kb.initialize()
+                _log_global_kb_status(kb)
+                # Publish only once fully initialized
+                kavak_kb_instance = kb
+    return kavak_kb_instance
+
+
+async def ainitialize_global_kavak_kb():
+    """Async variant of `initialize_global_kavak_kb` for the app lifespan.
+
+    `_akb_lock` lets a single coroutine build the instance while concurrent
+    callers wait for it; `_kb_lock` cannot be held across awaits, so it only
+    guards publishing against the threaded initializer.
+    """
+    global kavak_kb_instance
+    if kavak_kb_instance is None:
+        async with _akb_lock:
+            if kavak_kb_instance is None:
+                logger.info("Initializing Global Kavak Knowledge Base at startup...")
+                kb = KavakKnowledgeBase()
+                await kb.ainitialize()
+                await asyncio.to_thread(_log_global_kb_status, kb)
+                with _kb_lock:
+                    if kavak_kb_instance is None:
+                        kavak_kb_instance = kb
     return kavak_kb_instance
 
 
+def _log_global_kb_status(kb: KavakKnowledgeBase) -> None:
+    """Log the overall outcome of the global initialization attempt."""
+    if kb.initialization_error and not kb.is_ready:
+        logger.warning(
+            "Global Kavak Knowledge Base initialized, but RAG is not fully ready. Reason: %s. The agent will attempt to function with limited/no RAG capabilities.",
+            kb.initialization_error,
+        )
+    elif kb.is_ready:
+        logger.info("Global Kavak Knowledge Base initialized and RAG is ready.")
+    else:  # Should ideally be caught, but as a fallback
+        logger.warning(
+            "Global Kavak Knowledge Base initialized, but RAG is not ready. Status: %s. The agent will attempt to function with limited/no RAG capabilities.",
+            kb.initialization_error or "Unknown. Check KB logs.",
+        )
+
+
 def get_kavak_knowledge_base() -> KavakKnowledgeBase:
     """Get global knowledge base instance.
 
     Ensures that if accessed before explicit initialization (e.g. by lifespan manager),
     it attempts to initialize.
     """
-    global kavak_kb_instance
     if kavak_kb_instance is None:
         logger.warning(
             "Kavak Knowledge Base accessed before global initialization. Attempting to initialize now..."
@@ -2,13 +2,19 @@
 Kavak AI Sales Agent - Main FastAPI Application
 """
 
+import asyncio
+import logging
 import os
 from contextlib import asynccontextmanager
+from types import MappingProxyType
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import ORJSONResponse
 
 # Import configuration and core components first
+from src.config import settings
 from src.core.exceptions import setup_exception_handlers
 
 # Initialize logging
@@ -16,29 +22,84 @@ from src.core.logging import get_logger, setup_logging
 from src.core.middleware import setup_middleware
 
 # Import knowledge base initializer
-from src.knowledge.kavak_knowledge import initialize_global_kavak_kb
+from src.knowledge import kavak_knowledge
+from src.knowledge.kavak_knowledge import ainitialize_global_kavak_kb
 from src.schemas.responses import HealthCheckResponse, HealthStatus, RootResponse
+from src.tools.car_search import load_car_data
 
 # Import routes and schemas
 from src.webhook.twilio_handler import router as webhook_router
 
-# Configure logging using settings from config
-setup_logging()
-
 # Get logger for this module
 logger = get_logger(__name__)
 logger.info("Starting application...")
 
+# Static endpoint payloads are trusted, so build and serialize them once
+ROOT_ENDPOINTS = MappingProxyType(
+    {
+        "health": "/health",
+        "docs": "/docs",
+        "webhook": "/webhook/whatsapp",
+    }
+)
+ROOT_BODY = orjson.dumps(
+    RootResponse.model_construct(
+        message="¡Hola! Soy el agente comercial de Kavak 🚗",
+        description="Agente de IA para ayudarte a encontrar tu auto perfecto",
+        endpoints=dict(ROOT_ENDPOINTS),
+    ).model_dump(mode="json")
+)
+HEALTH_BODIES = {
+    health_status: orjson.dumps(
+        HealthCheckResponse.model_construct(
+            status=health_status,
+            service="Kavak AI Agent",
+            version="0.1.0",
+            language="es_MX",
+        ).model_dump(mode="json")
+    )
+    for health_status in (HealthStatus.OK, HealthStatus.STARTING)
+}
+
+
+async def _initialize_knowledge_base(app_instance: FastAPI) -> None:
+    """Initialize and warm the knowledge base in the background, flag readiness."""
+    try:
+        kb = await ainitialize_global_kavak_kb()
+        await asyncio.to_thread(kb.warmup)
+    except Exception as e:
+        logger.error("Knowledge base initialization failed: %s", e, exc_info=True)
+    finally:
+        app_instance.state.kb_ready.set()
+
+
+async def _warm_car_catalog() -> None:
+    """Parse the car catalog off the event loop so no request pays the cold load."""
+    df = await asyncio.to_thread(load_car_data)
+    logger.info("Car catalog warmed with %d records", len(df))
+
 
 # Lifespan Management
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI):
-    # Startup: Initialize Kavak Knowledge Base
+    # Startup: Configure logging; importing modules does not touch handlers
+    setup_logging()
+
+    # Startup: Initialize Kavak Knowledge Base without blocking the server;
+    # requests that need RAG wait on `kb_ready`
     logger.info("Application startup: Initializing Kavak Knowledge Base...")
-    initialize_global_kavak_kb()
+    app_instance.state.kb_ready = asyncio.Event()
+    kb_init_task = asyncio.create_task(_initialize_knowledge_base(app_instance))
+    catalog_task = asyncio.create_task(_warm_car_catalog())
     logger.info("Application startup in progress...")
     yield
-    # Shutdown (if any cleanup needed in the future)
+    # Shutdown: cancel unfinished startup work and wait for it to unwind, so
+    # nothing logs against torn-down state and cancellations are collected
+    startup_tasks = (kb_init_task, catalog_task)
+    for task in startup_tasks:
+        if not task.done():
+            task.cancel()
+    await asyncio.gather(*startup_tasks, return_exceptions=True)
     logger.info("Application shutdown.")
 
 
@@ -82,6 +143,7 @@ app = FastAPI(
         },
     ],
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Setup middlewares and exception handlers
@@ -104,11 +166,7 @@ app = setup_exception_handlers(app)
                     "example": {
                         "message": "¡Hola! Soy el agente comercial de Kavak 🚗",
                         "description": "Agente de IA para ayudarte a encontrar tu auto perfecto",
-                        "endpoints": {
-                            "health": "/health",
-                            "docs": "/docs",
-                            "webhook": "/webhook/whatsapp",
-                        },
+                        "endpoints": dict(ROOT_ENDPOINTS),
                     }
                 }
             },
@@ -116,19 +174,11 @@ app = setup_exception_handlers(app)
     },
     tags=["Root"],
 )
-async def root() -> RootResponse:
+async def root() -> Response:
     """
     Root endpoint that provides basic information about the API.
     """
-    return RootResponse(
-        message="¡Hola! Soy el agente comercial de Kavak 🚗",
-        description="Agente de IA para ayudarte a encontrar tu auto perfecto",
-        endpoints={
-            "health": "/health",
-            "docs": "/docs",
-            "webhook": "/webhook/whatsapp",
-        },
-    )
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 @app.get(
@@ -154,16 +204,27 @@ async def root() -> RootResponse:
         }
     },
 )
-async def health_check() -> HealthCheckResponse:
+async def health_check(request: Request) -> Response:
     """
     Check service status.
+
+    Reports STARTING while the knowledge base is still initializing.
     """
-    return HealthCheckResponse(
-        status=HealthStatus.OK,
-        service="Kavak AI Agent",
-        version="0.1.0",
-        language="es_MX",
+    # Skip building cache stats on every probe unless they will be logged
+    if kavak_knowledge.kavak_kb_instance is not None and logger.isEnabledFor(
+        logging.DEBUG
+    ):
+        logger.debug(
+            "Knowledge search cache: %s",
+            kavak_knowledge.kavak_kb_instance.search_cache_info(),
+        )
+    kb_ready = getattr(request.app.state, "kb_ready", None)
+    health_status = (
+        HealthStatus.STARTING
+        if kb_ready is not None and not kb_ready.is_set()
+        else HealthStatus.OK
     )
+    return Response(content=HEALTH_BODIES[health_status], media_type="application/json")
 
 
 # Include webhook routes
@@ -180,10 +241,23 @@ app.include_router(
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=port,
-        reload=True,
-        log_level="info",
-    )
+    if settings.is_production:
+        # uvloop + httptools ship with uvicorn[standard]; one worker per core
+        # unless WEB_CONCURRENCY says otherwise
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            log_level="info",
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            reload=True,
+            log_level="info",
+        )
@@ -12,6 +12,7 @@ class HealthStatus(str, Enum):
     """Health status values"""
 
     OK = "OK"
+    STARTING = "STARTING"
     ERROR = "ERROR"
 
 
@@ -1,30 +1,41 @@
 """
 Kavak AI Agent - Tools Module
 Herramientas del agente para búsqueda, financiamiento e información
+
+Tool submodules pull in pandas, rapidfuzz and langchain, so they are only
+imported on first attribute access (PEP 562).
 """
 
-from .car_search import (
-    get_popular_cars,
-    search_cars_by_budget,
-    search_specific_car,
-)
-from .financing import (
-    calculate_budget_by_monthly_payment,
-    calculate_financing,
-    calculate_multiple_options,
-)
-from .kavak_info import get_kavak_info, schedule_appointment
-
-__all__ = [
+from importlib import import_module
+from typing import Any
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
     # Car search tools
-    "search_cars_by_budget",
-    "search_specific_car",
-    "get_popular_cars",
+    "search_cars_by_budget": "car_search",
+    "search_specific_car": "car_search",
+    "get_popular_cars": "car_search",
     # Financing tools
-    "calculate_financing",
-    "calculate_multiple_options",
-    "calculate_budget_by_monthly_payment",
+    "calculate_financing": "financing",
+    "calculate_multiple_options": "financing",
+    "calculate_budget_by_monthly_payment": "financing",
     # Kavak info tools
-    "get_kavak_info",
-    "schedule_appointment",
-]
+    "get_kavak_info": "kavak_info",
+    "schedule_appointment": "kavak_info",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
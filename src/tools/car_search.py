@@ -2,11 +2,15 @@
 Car Search Tool
 """
 
+import functools
 import os
-import re
+import tempfile
 import unicodedata
-from typing import List, Optional, Tuple
+import warnings
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
+import numpy as np
 import pandas as pd
 from langchain.tools import tool
 from rapidfuzz import fuzz, process
@@ -16,35 +20,188 @@ from ..core.logging import get_logger
 # Initialize logger
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 # Path to car data
 CAR_DATA_PATH = os.path.join(
     os.path.dirname(__file__), "../../data/sample_caso_ai_engineer.csv"
 )
 
+# Pickled copy of the prepared catalog, rebuilt whenever the CSV is newer;
+# bump the version when the loader's columns or dtypes change
+CAR_DATA_CACHE_PATH = os.path.splitext(CAR_DATA_PATH)[0] + ".pkl"
+CAR_DATA_CACHE_VERSION = 1
+
+# Columns read from the CSV and their compact dtypes; low-cardinality text
+# columns are stored as pandas categoricals
+CAR_DATA_DTYPES = {
+    "stock_id": "int32",
+    "km": "int32",
+    "price": "float32",
+    "make": "category",
+    "model": "category",
+    "year": "int16",
+    "version": "object",
+    "bluetooth": "category",
+    "car_play": "category",
+}
+
+# Fallback when an integer column has blank cells
+_RELAXED_CAR_DATA_DTYPES = {
+    column: dtype
+    for column, dtype in CAR_DATA_DTYPES.items()
+    if not dtype.startswith("int")
+}
+
+# Columns unpacked per row when formatting listings
+_BUDGET_ROW_COLUMNS = ["make", "model", "year", "price", "km", "_features"]
+_DETAIL_ROW_COLUMNS = [
+    "make",
+    "model",
+    "year",
+    "version",
+    "price",
+    "km",
+    "_bt_icon",
+    "_cp_icon",
+    "stock_id",
+]
+
 
 def load_car_data() -> pd.DataFrame:
-    """Load car data from CSV file"""
-    logger.info("Loading car data from %s", CAR_DATA_PATH)
+    """Load car data from CSV file, reusing the parsed frame until it changes"""
     try:
-        df = pd.read_csv(CAR_DATA_PATH)
-        logger.info("Successfully loaded %d car records", len(df))
-        # Create searchable description for each car
-        df["descripcion"] = df.apply(
-            lambda row: (
-                f"{row['make']} {row['model']} {row['year']} {row['version']} - "
-                f"${row['price']:,.0f}, {row['km']:,} km\n"
-                f"Dimensiones: {row['largo']}mm (largo) x {row['ancho']}mm (ancho) x {row['altura']}mm (altura)\n"
-                f"Bluetooth: {row['bluetooth']}"
-                f"{', CarPlay: ' + str(row['car_play']) if pd.notna(row['car_play']) else ''}"
-            ),
-            axis=1,
-        )
-        return df
+        return _load_car_data_cached(os.stat(CAR_DATA_PATH).st_mtime)
     except Exception:
         logger.error("Error loading car data", exc_info=True)
         return pd.DataFrame()
 
 
+@functools.lru_cache(maxsize=1)
+def _load_car_data_cached(mtime: float) -> pd.DataFrame:
+    """Parse the CSV once per file modification time"""
+    df = _read_car_data_cache(mtime)
+    if df is None:
+        logger.info("Loading car data from %s", CAR_DATA_PATH)
+        try:
+            with warnings.catch_warnings():
+                # pandas warns about the NaN cast right before raising
+                warnings.simplefilter("ignore", RuntimeWarning)
+                df = _read_car_csv(CAR_DATA_DTYPES)
+        except ValueError:
+            # A blank cell cannot be parsed as a plain integer; let pandas
+            # infer those columns (float64) instead of dropping the catalog
+            logger.warning(
+                "Car data has missing integer values; loading without int dtypes"
+            )
+            df = _read_car_csv(_RELAXED_CAR_DATA_DTYPES)
+        _add_derived_columns(df)
+        _write_car_data_cache(df)
+    logger.info("Successfully loaded %d car records", len(df))
+    return df
+
+
+def _read_car_csv(dtypes: Dict[str, str]) -> pd.DataFrame:
+    """Parse the catalog CSV with the given column dtypes"""
+    return pd.read_csv(
+        CAR_DATA_PATH,
+        engine="c",
+        usecols=list(CAR_DATA_DTYPES),
+        dtype=dtypes,
+    )
+
+
+def _read_car_data_cache(csv_mtime: float) -> Optional[pd.DataFrame]:
+    """Return the pickled catalog if it is current, otherwise None"""
+    try:
+        if os.stat(CAR_DATA_CACHE_PATH).st_mtime < csv_mtime:
+            return None
+        cached = pd.read_pickle(CAR_DATA_CACHE_PATH)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning(
+            "Ignoring unreadable car data cache %s", CAR_DATA_CACHE_PATH, exc_info=True
+        )
+        return None
+    if cached.get("version") != CAR_DATA_CACHE_VERSION:
+        return None
+    logger.info("Loading car data from cache %s", CAR_DATA_CACHE_PATH)
+    return cached["frame"]
+
+
+def _write_car_data_cache(df: pd.DataFrame) -> None:
+    """Persist the prepared catalog so the next cold start skips CSV parsing
+
+    The pickle is written to a temporary file next to the cache and renamed
+    into place, so workers starting together never read a partial file.
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(CAR_DATA_CACHE_PATH) or ".", suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as tmp_file:
+            pd.to_pickle({"version": CAR_DATA_CACHE_VERSION, "frame": df}, tmp_file)
+        os.replace(tmp_path, CAR_DATA_CACHE_PATH)
+    except Exception:
+        logger.warning(
+            "Could not write car data cache %s", CAR_DATA_CACHE_PATH, exc_info=True
+        )
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _cached_per_frame(
+    builder: Callable[[pd.DataFrame], T],
+) -> Callable[[pd.DataFrame], T]:
+    """Cache ``builder(df)`` for the most recent frame, held by weak reference"""
+    slot: List[Any] = [None, None]
+
+    @functools.wraps(builder)
+    def wrapper(df: pd.DataFrame) -> T:
+        frame_ref, value = slot
+        if frame_ref is None or frame_ref() is not df:
+            value = builder(df)
+            slot[:] = [weakref.ref(df), value]
+        return value
+
+    return wrapper
+
+
+@_cached_per_frame
+def _cars_by_make(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Group cars by make, each group sorted by price; built once per frame"""
+    return {
+        make: group.sort_values("price")
+        for make, group in df.groupby("make", sort=False, observed=True)
+    }
+
+
+def _brand_groups(df: pd.DataFrame, brand_lc: str) -> List[pd.DataFrame]:
+    """Price-sorted per-make frames whose make contains ``brand_lc``"""
+    return [
+        group for make, group in _cars_by_make(df).items() if brand_lc in make.lower()
+    ]
+
+
+def _add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add lowercased make/model and preformatted feature columns"""
+    df["_make_lc"] = df["make"].str.lower()
+    df["_model_lc"] = df["model"].str.lower()
+    has_bluetooth = df["bluetooth"].eq("Sí").to_numpy()
+    has_carplay = df["car_play"].eq("Sí").to_numpy()
+    df["_bt_icon"] = np.where(has_bluetooth, "✅", "❌")
+    df["_cp_icon"] = np.where(has_carplay, "✅", "❌")
+    df["_features"] = np.where(
+        has_bluetooth, "✅ Bluetooth", "❌ Sin Bluetooth"
+    ).astype(object) + np.where(has_carplay, " • ✅ CarPlay", "").astype(object)
+    return df
+
+
 @tool
 def search_cars_by_budget(
     max_price: float,
@@ -65,21 +222,30 @@ def search_cars_by_budget(
         if df.empty:
             return "❌ No pude acceder al catálogo. ¿Intentamos de nuevo en un momento?"
 
-        # Filter by budget
-        filtered_cars = df[df["price"] <= max_price]
-
-        # Filter by brand if specified
         if brand:
+            # Filter by brand via the make index; each group is sorted by
+            # price, so the in-budget rows are a prefix found by binary search
             logger.debug("Filtering by brand: %s", brand)
-            brand_clean = brand.strip().title()
-            filtered_cars = filtered_cars[
-                filtered_cars["make"].str.contains(brand_clean, case=False, na=False)
+            brand_groups = _brand_groups(df, brand.strip().lower())
+            in_budget = [
+                int(group["price"].searchsorted(max_price, side="right"))
+                for group in brand_groups
             ]
-
-        # Sort by price (ascending)
-        filtered_cars = filtered_cars.sort_values("price")
-
-        if filtered_cars.empty:
+            total = sum(in_budget)
+            if total:
+                candidates = pd.concat(
+                    [
+                        group.iloc[: min(count, 5)]
+                        for group, count in zip(brand_groups, in_budget)
+                    ]
+                )
+        else:
+            # Filter by budget (single boolean mask, no intermediate frames)
+            mask = df["price"].to_numpy() <= max_price
+            total = int(mask.sum())
+            if total:
+                candidates = df.loc[mask]
+        if not total:
             return f"""
             🔍 No encontré autos con esos criterios.
 
@@ -90,33 +256,26 @@ def search_cars_by_budget(
             ¿Te ayudo con otras opciones? 😊
             """
 
-        # Format top 5 results
-        logger.info(
-            "Fuzzy search completed. Found %d matching vehicles", len(filtered_cars)
+        # Format the 5 cheapest results
+        logger.info("Budget search completed. Found %d matching vehicles", total)
+        results = candidates.nsmallest(5, "price")
+        response = (
+            f"🚗 Encontré {total} autos en tu presupuesto de ${max_price:,.0f}:\n\n"
         )
-        results = filtered_cars.head(5)
-        response = f"🚗 Encontré {len(filtered_cars)} autos en tu presupuesto de ${max_price:,.0f}:\n\n"
-
-        for idx, auto in results.iterrows():
-            bluetooth_text = (
-                "✅ Bluetooth" if auto["bluetooth"] == "Sí" else "❌ Sin Bluetooth"
-            )
-            carplay_text = (
-                " • ✅ CarPlay"
-                if pd.notna(auto["car_play"]) and auto["car_play"] == "Sí"
-                else ""
-            )
 
+        for make, model, year, price, km, features in results[
+            _BUDGET_ROW_COLUMNS
+        ].itertuples(index=False, name=None):
             response += f"""
-            **{auto["make"]} {auto["model"]} {auto["year"]}**
-            💰 ${auto["price"]:,.0f}
-            📍 {auto["km"]:,} km
-            {bluetooth_text}{carplay_text}
+            **{make} {model} {year}**
+            💰 ${price:,.0f}
+            📍 {km:,} km
+            {features}
             ---
             """
 
-        if len(filtered_cars) > 5:
-            response += f"\n¡Y {len(filtered_cars) - 5} opciones más!\n"
+        if total > 5:
+            response += f"\n¡Y {total - 5} opciones más!\n"
 
         response += "\n¿Te interesa alguno en particular? ¿Quieres más detalles? 😊"
 
@@ -143,11 +302,17 @@ def search_specific_car(brand: str, model: str) -> str:
         if df.empty:
             return "❌ No pude acceder al catálogo. ¿Intentamos de nuevo?"
 
-        # Search for specific make and model (case insensitive)
-        auto_encontrado = df[
-            (df["make"].str.contains(brand, case=False, na=False))
-            & (df["model"].str.contains(model, case=False, na=False))
-        ]
+        # Search for specific make and model (case insensitive); match the
+        # brand against the make index and only scan those makes' rows
+        brand_groups = _brand_groups(df, brand.lower())
+        auto_encontrado = df.iloc[:0]
+        if brand_groups:
+            candidates = pd.concat(brand_groups)
+            auto_encontrado = candidates[
+                candidates["_model_lc"].str.contains(
+                    model.lower(), regex=False, na=False
+                )
+            ]
 
         if auto_encontrado.empty:
             # Try fuzzy matching for common typos
@@ -168,21 +333,24 @@ def search_specific_car(brand: str, model: str) -> str:
         sorted_cars = auto_encontrado.sort_values("price")
         response = f"🚗 Encontré **{brand.title()} {model.title()}** disponible:\n\n"
 
-        for idx, auto in sorted_cars.iterrows():
-            bluetooth_icon = "✅" if auto["bluetooth"] == "Sí" else "❌"
-            carplay_icon = (
-                "✅"
-                if pd.notna(auto["car_play"]) and auto["car_play"] == "Sí"
-                else "❌"
-            )
-
+        for (
+            make,
+            model,
+            year,
+            version,
+            price,
+            km,
+            bluetooth_icon,
+            carplay_icon,
+            stock_id,
+        ) in sorted_cars[_DETAIL_ROW_COLUMNS].itertuples(index=False, name=None):
             response += f"""
-            **{auto["make"]} {auto["model"]} {auto["year"]}**
-            {auto["version"]}
-            💰 ${auto["price"]:,.0f}
-            📍 {auto["km"]:,} km
+            **{make} {model} {year}**
+            {version}
+            💰 ${price:,.0f}
+            📍 {km:,} km
             {bluetooth_icon} Bluetooth • {carplay_icon} CarPlay
-            Stock ID: {auto["stock_id"]}
+            Stock ID: {stock_id}
             ---
             """
 
@@ -196,6 +364,17 @@ def search_specific_car(brand: str, model: str) -> str:
         return f"❌ Error en la búsqueda: {str(e)}. ¿Puedes intentar de nuevo?"
 
 
+# Deletes every ASCII character that is neither a word character nor
+# whitespace, i.e. the ASCII subset of re.sub(r"[^\w\s]", "", text)
+_STRIP_PUNCTUATION = str.maketrans(
+    "",
+    "",
+    "".join(
+        c for c in map(chr, range(128)) if not (c.isalnum() or c == "_" or c.isspace())
+    ),
+)
+
+
 def _normalize_text(text: str) -> str:
     """Normalize text for better matching"""
     if not isinstance(text, str):
@@ -205,8 +384,13 @@ def _normalize_text(text: str) -> str:
     # Normalize accented characters to their base form
     text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
     # Remove any remaining special characters
-    text = re.sub(r"[^\w\s]", "", text)
-    return text
+    return text.translate(_STRIP_PUNCTUATION)
+
+
+@functools.lru_cache(maxsize=256)
+def _normalized_choices(choices: Tuple[str, ...]) -> Dict[str, str]:
+    """Map normalized choices to their original spelling, cached per choice set"""
+    return {_normalize_text(c): c for c in choices}
 
 
 def _get_best_match(
@@ -220,7 +404,7 @@ def _get_best_match(
     logger.debug("Finding best match for query: %s", query)
 
     # First try exact match
-    normalized_choices = {_normalize_text(c): c for c in choices}
+    normalized_choices = _normalized_choices(tuple(choices))
     normalized_query = _normalize_text(query)
     logger.debug("Normalized query: %s", normalized_query)
 
@@ -233,6 +417,7 @@ def _get_best_match(
         normalized_query,
         normalized_choices.keys(),
         scorer=fuzz.token_sort_ratio,
+        processor=None,  # Choices are already normalized
         score_cutoff=threshold,  # Early termination if no good match is found
     )
 
@@ -247,6 +432,36 @@ def _get_best_match(
     return (normalized_choices[best_match], score)
 
 
+# Common brand typos (whole-string replacements)
+_BRAND_TYPOS = {
+    "nisan": "nissan",
+    "toyoya": "toyota",
+    "vw": "volkswagen",
+    "vwv": "volkswagen",
+    "volks": "volkswagen",
+    "chevy": "chevrolet",
+    "cheverolet": "chevrolet",
+    "mazada": "mazda",
+    "mitsubitshi": "mitsubishi",
+    "mercedez": "mercedes",
+}
+
+# Common model typos (prefix -> canonical model)
+_MODEL_TYPOS = (
+    ("civic", "civic"),
+    ("sentra", "sentra"),
+    ("corolla", "corolla"),
+    ("jeta", "jetta"),
+    ("jetta", "jetta"),
+    ("golf", "golf"),
+    ("versa", "versa"),
+    ("march", "march"),
+    ("tsuru", "tsuru"),
+    ("aveo", "aveo"),
+    ("spark", "spark"),
+)
+
+
 def _correct_common_typos(text: str) -> str:
     """Correct common typos in car makes and models"""
     if not text:
@@ -256,46 +471,14 @@ def _correct_common_typos(text: str) -> str:
     text = text.lower()
     logger.debug("Correcting typos in: %s", original_text)
 
-    # Common brand typos
-    brand_typos = {
-        r"^nisan$": "nissan",
-        r"^toyoya$": "toyota",
-        r"^vw$": "volkswagen",
-        r"^vwv$": "volkswagen",
-        r"^volks$": "volkswagen",
-        r"^chevy$": "chevrolet",
-        r"^cheverolet$": "chevrolet",
-        r"^mazada$": "mazda",
-        r"^mitsubitshi$": "mitsubishi",
-        r"^mercedez$": "mercedes",
-        r"^bmw$": "bmw",
-    }
-
-    # Common model typos
-    model_typos = {
-        r"civic.*": "civic",
-        r"sentra.*": "sentra",
-        r"corolla.*": "corolla",
-        r"jeta.*": "jetta",
-        r"jetta.*": "jetta",
-        r"golf.*": "golf",
-        r"versa.*": "versa",
-        r"march.*": "march",
-        r"tsuru.*": "tsuru",
-        r"aveo.*": "aveo",
-        r"spark.*": "spark",
-    }
-
     # Apply brand corrections first
-    for typo, correction in brand_typos.items():
-        if re.search(typo, text):
-            text = re.sub(typo, correction, text)
-            logger.debug("Corrected brand typo: %s -> %s", original_text, text)
-            break  # Only apply one brand corrections
+    if text in _BRAND_TYPOS:
+        text = _BRAND_TYPOS[text]
+        logger.debug("Corrected brand typo: %s -> %s", original_text, text)
 
     # Then apply model corrections
-    for typo, correction in model_typos.items():
-        if re.match(typo, text):
+    for prefix, correction in _MODEL_TYPOS:
+        if text.startswith(prefix):
             return correction
 
     return text
@@ -315,9 +498,8 @@ def search_with_fuzzy_matching(
         logger.warning("Empty DataFrame provided to search_with_fuzzy_matching")
         return df
 
-    # Make copies to avoid SettingWithCopyWarning
-    df_filtered = df.copy()
-    logger.debug("Created working copy of DataFrame with %d rows", len(df_filtered))
+    # Boolean-mask filtering below returns new frames, so no upfront copy
+    df_filtered = df
 
     # Apply text normalization and corrections
     if brand:
@@ -362,16 +544,61 @@ def search_with_fuzzy_matching(
     return df_filtered
 
 
+@_cached_per_frame
+def _make_choices(df: pd.DataFrame) -> Dict[str, str]:
+    """Normalized -> original unique makes for the frame"""
+    return _normalized_choices(tuple(df["make"].dropna().unique()))
+
+
+@_cached_per_frame
+def _model_choices(df: pd.DataFrame) -> Dict[str, str]:
+    """Normalized -> original unique models for the frame"""
+    return _normalized_choices(tuple(df["model"].dropna().unique()))
+
+
+def _rank_similar(query: str, choices: Dict[str, str], limit: int = 5) -> str:
+    """Return the ``limit`` choices closest to ``query``, best first"""
+    matches = process.extract(
+        _normalize_text(query),
+        choices.keys(),
+        scorer=fuzz.WRatio,
+        processor=None,  # Choices are already normalized
+        limit=limit,
+    )
+    return ", ".join(choices[match] for match, _, _ in matches)
+
+
 def suggest_similar_brands(df: pd.DataFrame, brand: str) -> str:
     """Suggest similar brands"""
-    marcas_disponibles = df["make"].unique()[:5]
-    return ", ".join(marcas_disponibles)
+    return _rank_similar(brand, _make_choices(df))
 
 
 def suggest_similar_models(df: pd.DataFrame, model: str) -> str:
     """Suggest similar models"""
-    modelos_disponibles = df["model"].unique()[:5]
-    return ", ".join(modelos_disponibles)
+    return _rank_similar(model, _model_choices(df))
+
+
+@_cached_per_frame
+def _popular_cars_response(df: pd.DataFrame) -> str:
+    """Render the popular-cars listing once per catalog frame"""
+    # Get most common makes
+    popular_brands = df["make"].value_counts().head(5)
+
+    response = "🚗 **Autos más populares en Kavak:**\n\n"
+
+    cars_by_make = _cars_by_make(df)
+    for brand, count in popular_brands.items():
+        auto_ejemplo = cars_by_make[brand].iloc[0]
+        response += f"""
+            **{brand}** ({count} disponibles)
+            Desde ${auto_ejemplo["price"]:,.0f}
+            Ejemplo: {auto_ejemplo["model"]} {auto_ejemplo["year"]}
+            ---
+            """
+
+    response += "\n¿Te interesa alguna marca en particular? 😊"
+
+    return response
 
 
 @tool
@@ -387,23 +614,7 @@ def get_popular_cars() -> str:
         if df.empty:
             return "❌ No pude acceder al catálogo."
 
-        # Get most common makes
-        popular_brands = df["make"].value_counts().head(5)
-
-        response = "🚗 **Autos más populares en Kavak:**\n\n"
-
-        for brand, count in popular_brands.items():
-            auto_ejemplo = df[df["make"] == brand].sort_values("price").iloc[0]
-            response += f"""
-            **{brand}** ({count} disponibles)
-            Desde ${auto_ejemplo["price"]:,.0f}
-            Ejemplo: {auto_ejemplo["model"]} {auto_ejemplo["year"]}
-            ---
-            """
-
-        response += "\n¿Te interesa alguna marca en particular? 😊"
-
-        return response
+        return _popular_cars_response(df)
 
     except Exception as error:
         logger.error("Error getting popular cars: %s", str(error), exc_info=True)
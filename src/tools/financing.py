@@ -4,6 +4,7 @@ Financing Tool
 This module provides tools for calculating car financing options with Kavak.
 """
 
+import numpy as np
 from langchain.tools import tool
 
 from src.core.logging import get_logger
@@ -11,6 +12,25 @@ from src.core.logging import get_logger
 # Initialize logger
 logger = get_logger(__name__)
 
+ANNUAL_INTEREST_RATE = 0.10  # 10% as specified
+AVAILABLE_TERMS = (3, 4, 5, 6)  # Financing terms in years
+
+# Annuity factors for the fixed rate and terms, computed once:
+# payment = principal * _ANNUITY_FACTOR[years], principal = payment * _PV_FACTOR[years]
+# General formula for a fixed-rate loan: P = (PV * r * (1 + r)^n) / ((1 + r)^n - 1)
+_MONTHLY_RATE = ANNUAL_INTEREST_RATE / 12
+_ANNUITY_FACTOR = {
+    years: _MONTHLY_RATE
+    * (1 + _MONTHLY_RATE) ** (years * 12)
+    / ((1 + _MONTHLY_RATE) ** (years * 12) - 1)
+    for years in AVAILABLE_TERMS
+}
+_PV_FACTOR = {years: 1 / factor for years, factor in _ANNUITY_FACTOR.items()}
+
+# Same factors as arrays so all terms are priced in one broadcast
+_TERM_MONTHS = np.array(AVAILABLE_TERMS) * 12
+_TERM_FACTORS = np.array([_ANNUITY_FACTOR[years] for years in AVAILABLE_TERMS])
+
 
 @tool
 def calculate_financing(car_price: float, down_payment: float, years: int = 4) -> str:
@@ -50,15 +70,13 @@ def calculate_financing(car_price: float, down_payment: float, years: int = 4) -
             )
             return f"❌ {error_msg}. ¿Puedes verificar?"
 
-        if years not in [3, 4, 5, 6]:
+        if years not in AVAILABLE_TERMS:
             error_msg = f"Plazo no válido: {years}. Los plazos disponibles son: 3, 4, 5 o 6 años"
             logger.warning(error_msg)
             return f"❌ {error_msg}. ¿Cuál prefieres?"
 
         # Calculate financing
         amount_to_financier = car_price - down_payment
-        annual_interest_rate = 0.10  # 10% as specified
-        monthly_interest_rate = annual_interest_rate / 12
         months = years * 12
 
         if amount_to_financier <= 0:
@@ -73,13 +91,8 @@ def calculate_financing(car_price: float, down_payment: float, years: int = 4) -
             ¿Te ayudo con los trámites de compra? 🚗
             """
 
-        # Monthly payment formula
-        # General formula for a fixed-rate mortgage/loan: P = (PV * r * (1 + r)^n) / ((1 + r)^n - 1)
-        monthly_payment = (
-            amount_to_financier
-            * (monthly_interest_rate * (1 + monthly_interest_rate) ** months)
-            / ((1 + monthly_interest_rate) ** months - 1)
-        )
+        # Monthly payment formula (precomputed annuity factor)
+        monthly_payment = amount_to_financier * _ANNUITY_FACTOR[years]
         total_amount = monthly_payment * months
         total_interests = total_amount - amount_to_financier
 
@@ -114,12 +127,7 @@ def calculate_financing(car_price: float, down_payment: float, years: int = 4) -
         # Add comparison with other terms
         if years != 4:  # Show alternative if not default
             alt_years = 4
-            alt_months = alt_years * 12
-            alt_payment = (
-                amount_to_financier
-                * (monthly_interest_rate * (1 + monthly_interest_rate) ** alt_months)
-                / ((1 + monthly_interest_rate) ** alt_months - 1)
-            )
+            alt_payment = amount_to_financier * _ANNUITY_FACTOR[alt_years]
             response += f"\n💡 En {alt_years} años serían ${alt_payment:,.2f}/mes"
 
         response += (
@@ -163,16 +171,6 @@ def calculate_multiple_options(
             "down_payment_percentage": down_payment_percentage,
         },
     )
-    """
-    Calculate multiple financing options for different terms.
-
-    Args:
-        car_price: Vehicle price
-        down_payment_percentage: Down payment percentage (default 20%)
-
-    Returns:
-        Comparison table of financing options
-    """
     try:
         if car_price <= 0:
             error_msg = "El precio del auto debe ser mayor a $0"
@@ -188,7 +186,6 @@ def calculate_multiple_options(
 
         down_payment = car_price * (down_payment_percentage / 100)
         amount_to_financier = car_price - down_payment
-        monthly_interest_rate = 0.10 / 12  # 10% anual
 
         logger.info(
             "Multiple options calculation successful",
@@ -208,18 +205,16 @@ def calculate_multiple_options(
         **Opciones de pago:**
         """
 
-        for years in [3, 4, 5, 6]:
-            months = years * 12
-            monthly_payment = (
-                amount_to_financier
-                * (monthly_interest_rate * (1 + monthly_interest_rate) ** months)
-                / ((1 + monthly_interest_rate) ** months - 1)
-            )
-            total_amount = monthly_payment * months
-
-            response += f"""
+        monthly_payments = amount_to_financier * _TERM_FACTORS
+        total_amounts = monthly_payments * _TERM_MONTHS
+        response += "".join(
+            f"""
             📅 **{years} años:** ${monthly_payment:,.2f}/mes (Total: ${total_amount:,.2f})
             """
+            for years, monthly_payment, total_amount in zip(
+                AVAILABLE_TERMS, monthly_payments.tolist(), total_amounts.tolist()
+            )
+        )
 
         response += f"""
         ✅ Tasa: 10% anual fija
@@ -268,17 +263,6 @@ def calculate_budget_by_monthly_payment(
             "down_payment_percentage": down_payment_percentage,
         },
     )
-    """
-    Calculate the maximum car price that can be afforded with a specific monthly payment.
-
-    Args:
-        monthly_payment_desired: Monthly payment that can be afforded
-        years: Financing term in years
-        down_payment_percentage: Down payment percentage
-
-    Returns:
-        Maximum car price that can be afforded
-    """
     try:
         if monthly_payment_desired <= 0:
             error_msg = "El pago mensual debe ser mayor a $0"
@@ -287,20 +271,13 @@ def calculate_budget_by_monthly_payment(
             )
             return f"❌ {error_msg}"
 
-        if years not in [3, 4, 5, 6]:
+        if years not in AVAILABLE_TERMS:
             error_msg = f"Plazo no válido: {years}. Los plazos disponibles son: 3, 4, 5 o 6 años"
             logger.warning(error_msg, extra={"years": years})
             return f"❌ {error_msg}"
 
-        monthly_interest_rate = 0.10 / 12
-        months = years * 12
-
         # Calculate maximum loan amount from desired payment
-        max_amount_to_financier = (
-            monthly_payment_desired
-            * ((1 + monthly_interest_rate) ** months - 1)
-            / (monthly_interest_rate * (1 + monthly_interest_rate) ** months)
-        )
+        max_amount_to_financier = monthly_payment_desired * _PV_FACTOR[years]
 
         # Calculate total car price including down payment
         max_car_price = max_amount_to_financier / (1 - down_payment_percentage / 100)
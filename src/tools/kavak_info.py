@@ -5,7 +5,10 @@ This module provides tools to retrieve and format information about Kavak's serv
 warranties, and value proposition in Mexican Spanish.
 """
 
-from langchain.tools import tool
+import asyncio
+from typing import List
+
+from langchain.tools import StructuredTool, tool
 
 from ..config import settings
 from ..core.logging import get_logger
@@ -13,12 +16,88 @@ from ..knowledge.kavak_knowledge import get_kavak_knowledge_base
 
 logger = get_logger(__name__)
 
+# Static tool replies, built once at import instead of inside each call
+APPOINTMENT_MESSAGE = """📅 **¡Agenda tu Cita en Kavak!** 🚗
 
-@tool
-def get_kavak_info(query: str) -> str:
+    ¡Perfecto! Uno de nuestros asesores se pondrá en contacto contigo a la brevedad para ayudarte a agendar tu cita.
+
+    📋 **Por favor ten a la mano:**
+    • Identificación oficial (INE/IFE)
+    • Comprobante de domicilio
+    • Comprobantes de ingresos (si aplica para financiamiento)
+    • Documentos de tu auto actual (si planeas dejarlo a cuenta)
+    """
+
+NO_CLEAR_TEXT_MESSAGE = "🤔 Encontré información relacionada, pero no un texto claro para mostrar. ¿Puedes intentar otra pregunta?"
+
+INFO_ERROR_MESSAGE = "⚠️ ¡Ups! Hubo un problema al buscar la información. Por favor, inténtalo de nuevo en un momento. Si el problema persiste, no dudes en contactar a nuestro equipo de soporte."
+
+
+def _ready_knowledge_base():
+    """Return the knowledge base if it can serve searches, otherwise None."""
+    kb = get_kavak_knowledge_base()
+    if not kb or not kb.is_ready:
+        logger.warning(
+            "KavakKnowledgeBase not ready or not available in get_kavak_info. Status: %s",
+            kb.initialization_error if kb else "KB is None",
+        )
+        return None
+    return kb
+
+
+def _format_kavak_info(query: str, documents: List[str]) -> str:
+    """Turn retrieved documents into the WhatsApp-sized tool reply."""
+    if not documents:
+        # Return an empty string to signal that no specific info was found by RAG.
+        # The agent will then attempt to answer using its general system prompt knowledge.
+        logger.info(
+            "No specific RAG results for query: '%s'. Returning empty string to agent.",
+            query,
+        )
+        return ""
+
+    # Ensure the response does not exceed the character limit
+    max_length = (
+        getattr(settings, "RESPONSE_MAX_LENGTH", 1500) - 100
+    )  # Leave space for the closing
+
+    # Combine content from results into a single string, stopping once the
+    # limit is passed since anything beyond it is cut below anyway
+    parts = []
+    length = -2  # No separator before the first document
+    for doc in documents:
+        if doc:
+            parts.append(doc)
+            length += len(doc) + 2
+            if length > max_length:
+                break
+
+    if all(part.isspace() for part in parts):
+        return NO_CLEAR_TEXT_MESSAGE
+
+    combined_content = "\n\n".join(parts)
+    if len(combined_content) > max_length:
+        # Find the last period before the limit for a clean cut
+        cutoff = combined_content.rfind(".", 0, max_length)
+        if cutoff == -1:  # If no periods, cut at the limit
+            cutoff = max_length
+        results_string = (
+            combined_content[:cutoff]
+            + ".\n\n¿Te gustaría que profundice en algún aspecto en particular? 😊"
+        )
+    else:
+        results_string = combined_content
+
+    return results_string
+
+
+def _get_kavak_info(query: str) -> str:
     """
     Gets general information about Kavak and its services.
 
+    Only call this for questions about Kavak's warranties, policies, processes
+    or company facts; not for greetings, car searches or financing math.
+
     Args:
         query: User's query about Kavak, its services, processes, etc.
 
@@ -27,57 +106,50 @@ def get_kavak_info(query: str) -> str:
         formatted for WhatsApp.
     """
     try:
-        kb = get_kavak_knowledge_base()
-        if not kb or not kb.is_ready:
-            logger.warning(
-                f"KavakKnowledgeBase not ready or not available in get_kavak_info. Status: {kb.initialization_error if kb else 'KB is None'}"
-            )
+        kb = _ready_knowledge_base()
+        if kb is None:
             # Return an empty string to signal that no specific info was found by RAG.
             return ""
 
-        # Obtain information from the knowledge base using search_knowledge
-        search_results = kb.search_knowledge(
+        # Obtain information from the knowledge base; only the document text is
+        # needed here, so skip building per-document dicts
+        search_results = kb.search_knowledge_arrays(
             query=query, top_k=1
         )  # Fetch top 1 for now, can be adjusted
+        return _format_kavak_info(query, search_results["documents"])
 
-        if not search_results:
-            # Return an empty string to signal that no specific info was found by RAG.
-            # The agent will then attempt to answer using its general system prompt knowledge.
-            logger.info(
-                f"No specific RAG results for query: '{query}'. Returning empty string to agent."
-            )
-            return ""
+    except Exception as e:
+        logger.error("Error en get_kavak_info: %s", e)
+        return INFO_ERROR_MESSAGE
 
-        # Combine content from results into a single string
-        # If search_knowledge structures results differently, this needs adjustment.
-        combined_content = "\n\n".join(
-            [res.get("content", "") for res in search_results if res.get("content")]
-        )
 
-        if not combined_content.strip():
-            return "🤔 Encontré información relacionada, pero no un texto claro para mostrar. ¿Puedes intentar otra pregunta?"
-
-        # Ensure the response does not exceed the character limit
-        max_length = (
-            getattr(settings, "RESPONSE_MAX_LENGTH", 1500) - 100
-        )  # Leave space for the closing
-        if len(combined_content) > max_length:
-            # Find the last period before the limit for a clean cut
-            cutoff = combined_content.rfind(".", 0, max_length)
-            if cutoff == -1:  # If no periods, cut at the limit
-                cutoff = max_length
-            results_string = (
-                combined_content[:cutoff]
-                + ".\n\n¿Te gustaría que profundice en algún aspecto en particular? 😊"
-            )
-        else:
-            results_string = combined_content
-
-        return results_string
+async def _aget_kavak_info(query: str) -> str:
+    """Async variant used by the agent executor.
+
+    Goes through `asearch_knowledge_arrays`, so the event loop is never
+    blocked, repeated questions are served from the search cache and parallel
+    tool calls in one agent turn share a batched Chroma query. Readiness is
+    checked there, only when the cache misses.
+    """
+    try:
+        kb = await asyncio.to_thread(get_kavak_knowledge_base)
+        if kb is None:
+            logger.warning("KavakKnowledgeBase not available in get_kavak_info.")
+            return ""
+
+        search_results = await kb.asearch_knowledge_arrays(query, top_k=1)
+        return _format_kavak_info(query, search_results["documents"])
 
     except Exception as e:
-        logger.error(f"Error en get_kavak_info: {str(e)}")
-        return "⚠️ ¡Ups! Hubo un problema al buscar la información. Por favor, inténtalo de nuevo en un momento. Si el problema persiste, no dudes en contactar a nuestro equipo de soporte."
+        logger.error("Error en get_kavak_info: %s", e)
+        return INFO_ERROR_MESSAGE
+
+
+get_kavak_info = StructuredTool.from_function(
+    func=_get_kavak_info,
+    coroutine=_aget_kavak_info,
+    name="get_kavak_info",
+)
 
 
 @tool
@@ -88,13 +160,4 @@ def schedule_appointment() -> str:
     Returns:
         Instructions for scheduling an appointment in Mexican Spanish, formatted for WhatsApp.
     """
-    return """📅 **¡Agenda tu Cita en Kavak!** 🚗
-
-    ¡Perfecto! Uno de nuestros asesores se pondrá en contacto contigo a la brevedad para ayudarte a agendar tu cita.
-
-    📋 **Por favor ten a la mano:**
-    • Identificación oficial (INE/IFE)
-    • Comprobante de domicilio
-    • Comprobantes de ingresos (si aplica para financiamiento)
-    • Documentos de tu auto actual (si planeas dejarlo a cuenta)
-    """
+    return APPOINTMENT_MESSAGE
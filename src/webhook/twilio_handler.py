@@ -2,11 +2,14 @@
 Twilio WhatsApp Webhook Handler
 """
 
+import asyncio
+import re
 import time
+import weakref
+from xml.sax.saxutils import escape as xml_escape
 
-from fastapi import APIRouter, Form, HTTPException, status
+from fastapi import APIRouter, Form, HTTPException, Request, status
 from fastapi.responses import Response
-from twilio.twiml.messaging_response import MessagingResponse
 
 from ..agent.kavak_agent import create_kavak_agent
 from ..agent.redis_memory import redis_memory
@@ -29,6 +32,25 @@ logger = get_logger(__name__)
 # Create router
 router = APIRouter()
 
+# TwiML for a single reply; matches what MessagingResponse serializes to
+TWIML_MESSAGE_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    "<Response><Message>{0}</Message></Response>"
+)
+
+# Error replies are constant, so their TwiML is encoded once at import
+HTTP_ERROR_TWIML = TWIML_MESSAGE_TEMPLATE.format(
+    xml_escape(
+        "¡Ups! No pude procesar tu solicitud. Por favor, inténtalo de nuevo más tarde. 🛠️"
+    )
+).encode("utf-8")
+ERROR_TWIML = TWIML_MESSAGE_TEMPLATE.format(
+    xml_escape(
+        "¡Ups! Algo salió mal en nuestro sistema. "
+        "Nuestro equipo ha sido notificado. Por favor, inténtalo de nuevo en un momento. 🛠️"
+    )
+).encode("utf-8")
+
 
 # Initialize agent with tools
 def get_kavak_agent():
@@ -54,6 +76,49 @@ def get_kavak_agent():
 kavak_agent = get_kavak_agent()
 
 
+# Keywords that pick the canned reply when the agent fails
+GREETING_WORDS = frozenset({"hola", "hello", "hi", "buenas"})
+CAR_WORDS = frozenset(
+    {
+        "auto",
+        "autos",
+        "carro",
+        "carros",
+        "vehiculo",
+        "vehiculos",
+        "vehículo",
+        "vehículos",
+        "coche",
+        "coches",
+    }
+)
+FINANCING_WORDS = frozenset(
+    {"precio", "precios", "financiamiento", "pago", "pagos", "dinero", "pagar"}
+)
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Per-session turn locks; entries disappear once no request holds the lock
+_session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def session_lock(session_id: str) -> asyncio.Lock:
+    """Return the lock that serializes turns of one conversation."""
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = _session_locks[session_id] = asyncio.Lock()
+    return lock
+
+
+async def wait_for_knowledge_base(request: Request) -> None:
+    """Wait for the background knowledge base initialization, if running."""
+    kb_ready = getattr(request.app.state, "kb_ready", None)
+    if kb_ready is not None and not kb_ready.is_set():
+        logger.info("Waiting for knowledge base initialization...")
+        await kb_ready.wait()
+
+
 @router.post(
     "/whatsapp",
     status_code=status.HTTP_200_OK,
@@ -102,6 +167,7 @@ kavak_agent = get_kavak_agent()
     response_description="TwiML response for Twilio",
 )
 async def whatsapp_webhook(
+    request: Request,
     Body: str = Form(..., description="The message text from the user"),
     From: str = Form(..., description="User's WhatsApp number with 'whatsapp:' prefix"),
     To: str = Form(..., description="Twilio number that received the message"),
@@ -132,92 +198,86 @@ async def whatsapp_webhook(
     """
     try:
         logger.info("WhatsApp message received")
-        logger.info(f"From: {From}")
-        logger.info(f"MessageSid: {MessageSid}")
-        logger.debug(f"Message body: {Body}")
+        logger.info("From: %s", From)
+        logger.info("MessageSid: %s", MessageSid)
+        logger.debug("Message body: %s", Body)
 
         # Clean phone number (remove whatsapp: prefix)
         user_phone = From.replace("whatsapp:", "")
 
-        # Get conversation context
+        # Get conversation context; turns of one session run one at a time so
+        # concurrent messages cannot overwrite each other's history
         session_id = f"whatsapp_{user_phone}"
-        conversation_history = redis_memory.get_conversation(session_id)
-
-        # Process message with Kavak agent
-        agent_response = await process_with_kavak_agent(
-            message=Body,
-            session_id=session_id,
-            conversation_history=conversation_history,
-        )
-
-        # Save conversation turn
-        conversation_history.append(
-            {"user": Body, "agent": agent_response, "timestamp": MessageSid}
-        )
-        redis_memory.save_conversation(session_id, conversation_history)
-
-        # Create TwiML response
-        twiml_response = MessagingResponse()
+        async with session_lock(session_id):
+            conversation_history = redis_memory.get_conversation(session_id)
+
+            # Process message with Kavak agent
+            await wait_for_knowledge_base(request)
+            agent_response = await process_with_kavak_agent(
+                message=Body,
+                session_id=session_id,
+                conversation_history=conversation_history,
+            )
+
+            # Save conversation turn
+            conversation_history.append(
+                {"user": Body, "agent": agent_response, "timestamp": MessageSid}
+            )
+            redis_memory.save_conversation(session_id, conversation_history)
 
         # Split response if too long (WhatsApp limit is 4096 chars per message)
         max_length = 3000  # Conservative limit to account for TwiML overhead
         if len(agent_response) > max_length:
-            chunks = [
-                agent_response[i : i + max_length]
-                for i in range(0, len(agent_response), max_length)
-            ]
-            for chunk in chunks:
+            # Rare multi-chunk path; the twilio helper is imported on demand
+            from twilio.twiml.messaging_response import MessagingResponse
+
+            twiml_response = MessagingResponse()
+            for start in range(0, len(agent_response), max_length):
+                chunk = agent_response[start : start + max_length]
                 twiml_response.message(chunk)
-                logger.info(f"Sending chunk: {chunk[:100]}...")
+                logger.info("Sending chunk: %.100s...", chunk)
+            twiml_str = str(twiml_response)
         else:
-            twiml_response.message(agent_response)
-            logger.info(f"Sending response: {agent_response[:100]}...")
+            # Single message: format the TwiML directly instead of building
+            # and serializing a MessagingResponse
+            twiml_str = TWIML_MESSAGE_TEMPLATE.format(xml_escape(agent_response))
+            logger.info("Sending response: %.100s...", agent_response)
 
-        # Convert to string and log the raw TwiML for debugging
-        twiml_str = str(twiml_response)
-        logger.debug(f"Raw TwiML response: {twiml_str}")
+        # Log the raw TwiML for debugging
+        logger.debug("Raw TwiML response: %s", twiml_str)
 
         # Return response with proper headers
         return Response(
-            content=twiml_str,
+            content=twiml_str.encode("utf-8"),
             media_type="application/xml",
             headers={"X-Twilio-Webhook": "true"},
         )
 
     except HTTPException as http_exc:
         # Re-raise HTTP exceptions with their original status codes
-        logger.error(f"HTTP error processing message: {http_exc.detail}")
-        error_response = MessagingResponse()
-        error_response.message(
-            "¡Ups! No pude procesar tu solicitud. Por favor, inténtalo de nuevo más tarde. 🛠️"
-        )
+        logger.error("HTTP error processing message: %s", http_exc.detail)
         return Response(
-            content=str(error_response),
+            content=HTTP_ERROR_TWIML,
             media_type="application/xml",
             status_code=http_exc.status_code,
             headers={"X-Twilio-Webhook": "true"},
         )
 
     except Exception as e:
-        logger.error(f"Error processing WhatsApp message: {str(e)}", exc_info=True)
-
-        # Create a user-friendly error response
-        error_response = MessagingResponse()
-        error_message = (
-            "¡Ups! Algo salió mal en nuestro sistema. "
-            "Nuestro equipo ha sido notificado. Por favor, inténtalo de nuevo en un momento. 🛠️"
-        )
-        error_response.message(error_message)
+        logger.error("Error processing WhatsApp message: %s", e)
 
         # Log the error with additional context
         logger.error(
-            f"Error processing message from {From}. "
-            f"MessageSid: {MessageSid}. Error: {str(e)}",
+            "Error processing message from %s. MessageSid: %s. Error: %s",
+            From,
+            MessageSid,
+            e,
             exc_info=True,
         )
 
+        # Reply with the user-friendly error message
         return Response(
-            content=str(error_response),
+            content=ERROR_TWIML,
             media_type="application/xml",
             status_code=status.HTTP_200_OK,  # Must return 200 to Twilio
             headers={"X-Twilio-Webhook": "true"},
@@ -238,7 +298,7 @@ async def process_with_kavak_agent(
     Returns:
         Agent's response optimized for WhatsApp
     """
-    logger.info(f"Processing message with agent: {message}")
+    logger.info("Processing message with agent: %s", message)
 
     try:
         # Process with agent
@@ -250,9 +310,9 @@ async def process_with_kavak_agent(
         )
 
         logger.info(
-            f"Agent response: {response[:200]}..."
-            if len(str(response)) > 200
-            else f"Agent response: {response}"
+            "Agent response: %.200s%s",
+            response,
+            "..." if len(str(response)) > 200 else "",
         )
 
         if not response or response.strip() == "":
@@ -262,18 +322,15 @@ async def process_with_kavak_agent(
         return response
 
     except Exception as e:
-        logger.error(f"Agent processing error: {str(e)}", exc_info=True)
-        logger.error(f"Error type: {type(e).__name__}")
-
-        # Log the full error for debugging
-        import traceback
-
-        logger.error(f"Stack trace: {traceback.format_exc()}")
+        # exc_info attaches the stack trace only when the record is emitted
+        logger.error(
+            "Agent processing error (%s): %s", type(e).__name__, e, exc_info=True
+        )
 
-        # Return contextual fallback based on message content
-        message_lower = message.lower()
+        # Return contextual fallback based on the words in the message
+        words = set(_WORD_PATTERN.findall(message.lower()))
 
-        if any(word in message_lower for word in ["hola", "hello", "hi", "buenas"]):
+        if words & GREETING_WORDS:
             logger.info("Using greeting fallback")
             return """
             ¡Hola! Soy tu agente comercial de Kavak 🚗
@@ -287,9 +344,7 @@ async def process_with_kavak_agent(
             ¿Qué tipo de auto buscas?
             """
 
-        elif any(
-            word in message_lower for word in ["auto", "carro", "vehiculo", "coche"]
-        ):
+        elif words & CAR_WORDS:
             logger.info("Using car search fallback")
             return """
             ¡Perfecto! Te ayudo a encontrar tu auto ideal 🚗
@@ -302,10 +357,7 @@ async def process_with_kavak_agent(
             ¡Tengo excelentes opciones para ti! 😊
             """
 
-        elif any(
-            word in message_lower
-            for word in ["precio", "financiamiento", "pago", "dinero", "pagar"]
-        ):
+        elif words & FINANCING_WORDS:
             logger.info("Using financing fallback")
             return """
             💰 ¡Claro! Te ayudo con el financiamiento.
@@ -319,7 +371,7 @@ async def process_with_kavak_agent(
             """
 
         else:
-            logger.warning(f"Using general error fallback for message: {message}")
+            logger.warning("Using general error fallback for message: %s", message)
             return "¡Ups! Algo salió mal. Por favor, inténtalo de nuevo en un momento."
 
 
@@ -404,7 +456,9 @@ async def webhook_status():
     },
     tags=["Testing"],
 )
-async def test_agent_locally(message: str, session_id: str = "test_session"):
+async def test_agent_locally(
+    request: Request, message: str, session_id: str = "test_session"
+):
     """
     Test endpoint for local agent testing
 
@@ -413,6 +467,7 @@ async def test_agent_locally(message: str, session_id: str = "test_session"):
     """
     try:
         start_time = time.time()
+        await wait_for_knowledge_base(request)
         response = await process_with_kavak_agent(
             message=message,
             session_id=session_id,
@@ -427,7 +482,7 @@ async def test_agent_locally(message: str, session_id: str = "test_session"):
         }
 
     except Exception as e:
-        logger.error(f"Error in test_agent_locally: {str(e)}", exc_info=True)
+        logger.error("Error in test_agent_locally: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error processing your request",
@@ -11,6 +11,19 @@ from unittest.mock import MagicMock
 # Add the project root to the path so imports work correctly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from src.tools.car_search import _load_car_data_cached  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_car_data_cache(tmp_path, monkeypatch):
+    """Drop the cached catalog so each test sees its own mocked CSV"""
+    monkeypatch.setattr(
+        "src.tools.car_search.CAR_DATA_CACHE_PATH", str(tmp_path / "catalog.pkl")
+    )
+    _load_car_data_cached.cache_clear()
+    yield
+    _load_car_data_cached.cache_clear()
+
 
 @pytest.fixture
 def sample_car_data():
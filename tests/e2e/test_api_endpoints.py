@@ -2,12 +2,16 @@
 End-to-end tests for API endpoints
 """
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, AsyncMock
+from twilio.twiml.messaging_response import MessagingResponse
+from unittest.mock import patch, AsyncMock, MagicMock
 
-from src.main import app
-from src.webhook.twilio_handler import process_with_kavak_agent
+from src.main import app, lifespan
+from src.webhook.twilio_handler import process_with_kavak_agent, whatsapp_webhook
 
 
 class TestAPIEndpoints:
@@ -40,6 +44,54 @@ class TestAPIEndpoints:
         assert response.json()["service"] == "Kavak AI Agent"
         assert response.json()["language"] == "es_MX"
 
+    def test_health_check_skips_cache_stats_unless_debug(self, client):
+        """Test health probes only build search cache stats for debug logging"""
+        mock_kb = MagicMock()
+        with patch("src.knowledge.kavak_knowledge.kavak_kb_instance", mock_kb):
+            with patch("src.main.logger.isEnabledFor", return_value=False):
+                assert client.get("/health").status_code == 200
+            mock_kb.search_cache_info.assert_not_called()
+
+            with patch("src.main.logger.isEnabledFor", return_value=True):
+                assert client.get("/health").status_code == 200
+            mock_kb.search_cache_info.assert_called_once()
+
+    async def test_lifespan_waits_for_cancelled_startup_tasks(self):
+        """Test shutdown cancels and awaits unfinished startup tasks"""
+        unwound = []
+
+        async def hang(*args):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                await asyncio.sleep(0)
+                unwound.append(True)
+                raise
+
+        with (
+            patch("src.main._initialize_knowledge_base", hang),
+            patch("src.main._warm_car_catalog", hang),
+            patch("src.main.setup_logging"),
+        ):
+            async with lifespan(app):
+                await asyncio.sleep(0)
+
+        assert unwound == [True, True]
+
+    def test_health_check_while_knowledge_base_starting(self, client):
+        """Test health check reports STARTING until the knowledge base is ready"""
+        app.state.kb_ready = asyncio.Event()
+        try:
+            response = client.get("/health")
+            assert response.status_code == 200
+            assert response.json()["status"] == "STARTING"
+
+            app.state.kb_ready.set()
+            response = client.get("/health")
+            assert response.json()["status"] == "OK"
+        finally:
+            del app.state.kb_ready
+
     @patch("src.webhook.twilio_handler.process_with_kavak_agent")
     def test_whatsapp_webhook(self, mock_process, client):
         """Test WhatsApp webhook endpoint"""
@@ -71,6 +123,51 @@ class TestAPIEndpoints:
         assert call_args["message"] == "Hola"
         assert "session_id" in call_args
 
+    @patch("src.webhook.twilio_handler.process_with_kavak_agent")
+    def test_whatsapp_webhook_twiml_matches_messaging_response(
+        self, mock_process, client
+    ):
+        """Test single-message TwiML is escaped like MessagingResponse"""
+        agent_response = 'Precio < $300,000 & garantía "Kavak" 🚗'
+        mock_process.return_value = agent_response
+
+        response = client.post(
+            "/webhook/whatsapp",
+            data={
+                "Body": "Hola",
+                "From": "whatsapp:+5215512345678",
+                "To": "whatsapp:+14155238886",
+                "MessageSid": "SM123456789",
+            },
+        )
+
+        expected = MessagingResponse()
+        expected.message(agent_response)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/xml")
+        assert response.text == str(expected)
+
+    @patch("src.webhook.twilio_handler.process_with_kavak_agent")
+    def test_whatsapp_webhook_splits_long_response(self, mock_process, client):
+        """Test long agent responses are sent as several TwiML messages"""
+        mock_process.return_value = "a" * 3000 + "b" * 10
+
+        response = client.post(
+            "/webhook/whatsapp",
+            data={
+                "Body": "Hola",
+                "From": "whatsapp:+5215512345678",
+                "To": "whatsapp:+14155238886",
+                "MessageSid": "SM123456789",
+            },
+        )
+
+        expected = MessagingResponse()
+        expected.message("a" * 3000)
+        expected.message("b" * 10)
+        assert response.status_code == 200
+        assert response.text == str(expected)
+
     @patch("src.webhook.twilio_handler.process_with_kavak_agent")
     def test_whatsapp_webhook_error(self, mock_process, client):
         """Test WhatsApp webhook with error"""
@@ -94,6 +191,47 @@ class TestAPIEndpoints:
         assert "<Message>" in response.text
         assert "¡Ups!" in response.text or "Lo siento" in response.text
 
+    async def test_whatsapp_webhook_serializes_turns_per_session(self):
+        """Test concurrent messages from one user do not drop turns"""
+        store = {}
+
+        async def slow_agent(message, session_id, conversation_history):
+            await asyncio.sleep(0.01)
+            return f"Respuesta a {message}"
+
+        request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+        with (
+            patch(
+                "src.webhook.twilio_handler.process_with_kavak_agent",
+                side_effect=slow_agent,
+            ),
+            patch(
+                "src.webhook.twilio_handler.redis_memory.get_conversation",
+                side_effect=lambda session_id: list(store.get(session_id, [])),
+            ),
+            patch(
+                "src.webhook.twilio_handler.redis_memory.save_conversation",
+                side_effect=lambda session_id, history: store.update(
+                    {session_id: list(history)}
+                ),
+            ),
+        ):
+            await asyncio.gather(
+                *(
+                    whatsapp_webhook(
+                        request,
+                        Body=body,
+                        From="whatsapp:+5215512345678",
+                        To="whatsapp:+14155238886",
+                        MessageSid=f"SM{index}",
+                    )
+                    for index, body in enumerate(["Hola", "Busco un auto"])
+                )
+            )
+
+        history = store["whatsapp_+5215512345678"]
+        assert [turn["user"] for turn in history] == ["Hola", "Busco un auto"]
+
     @patch(
         "src.webhook.twilio_handler.process_with_kavak_agent", new_callable=AsyncMock
     )
@@ -221,3 +359,23 @@ class TestProcessWithKavakAgent:
         # Verify result is the full long response from the mock, as process_with_kavak_agent doesn't truncate
         assert len(result) == 10000
         assert "Respuesta" in result
+
+    @patch("src.webhook.twilio_handler.kavak_agent")
+    async def test_process_with_agent_error_matches_whole_words(self, mock_agent):
+        """Test the error fallback picks a reply by whole words only"""
+        mock_agent.process_message = AsyncMock(side_effect=Exception("Test error"))
+
+        # "hi" inside "vehículos" must not select the greeting
+        result = await process_with_kavak_agent(
+            message="¿Qué vehículos tienen?",
+            session_id="test_session",
+            conversation_history=[],
+        )
+        assert "Te ayudo a encontrar tu auto ideal" in result
+
+        result = await process_with_kavak_agent(
+            message="¿Cuánto es el pago mensual?",
+            session_id="test_session",
+            conversation_history=[],
+        )
+        assert "Te ayudo con el financiamiento" in result
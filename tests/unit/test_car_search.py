@@ -2,11 +2,15 @@
 Unit tests for car search tools
 """
 
+import os
+
 import pandas as pd
 import pytest
 from unittest.mock import patch
 
+from src.tools import car_search
 from src.tools.car_search import (
+    load_car_data,
     search_cars_by_budget,
     search_specific_car,
     get_popular_cars,
@@ -14,6 +18,12 @@ from src.tools.car_search import (
     _normalize_text,
     _correct_common_typos,
     _get_best_match,
+    _add_derived_columns,
+    _normalized_choices,
+    _cars_by_make,
+    _popular_cars_response,
+    suggest_similar_brands,
+    suggest_similar_models,
 )
 
 
@@ -87,6 +97,18 @@ class TestCarSearchTools:
         # Empty choices
         assert _get_best_match("Toyota", []) is None
 
+    def test_get_best_match_reuses_normalized_choices(self):
+        """Test the normalized choice map is built once per choice set"""
+        _normalized_choices.cache_clear()
+        choices = ["Toyota", "Honda", "Nissan"]
+
+        assert _get_best_match("toyota", choices) == ("Toyota", 100)
+        assert _get_best_match("Hond", choices)[0] == "Honda"
+
+        info = _normalized_choices.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
     @pytest.fixture
     def sample_car_data(self):
         """Fixture providing sample car data for testing"""
@@ -132,6 +154,98 @@ class TestCarSearchTools:
         result = search_with_fuzzy_matching(sample_car_data, "Toyóta", "Corólla")
         assert not result.empty
 
+    def test_load_car_data_is_cached_per_mtime(
+        self, tmp_path, monkeypatch, sample_car_data
+    ):
+        """Test the CSV is parsed once and re-read only when it changes"""
+        csv_path = tmp_path / "cars.csv"
+        sample_car_data.assign(stock_id=range(5)).to_csv(csv_path, index=False)
+        monkeypatch.setattr("src.tools.car_search.CAR_DATA_PATH", str(csv_path))
+
+        with patch(
+            "src.tools.car_search.pd.read_csv", wraps=pd.read_csv
+        ) as mock_read_csv:
+            first = load_car_data()
+            assert load_car_data() is first
+            assert mock_read_csv.call_count == 1
+
+            stat = csv_path.stat()
+            os.utime(csv_path, (stat.st_atime, stat.st_mtime + 10))
+            assert load_car_data() is not first
+            assert mock_read_csv.call_count == 2
+
+    def test_load_car_data_uses_pickle_cache(
+        self, tmp_path, monkeypatch, sample_car_data
+    ):
+        """Test a cold start reads the pickled catalog instead of the CSV"""
+        csv_path = tmp_path / "cars.csv"
+        sample_car_data.assign(stock_id=range(5)).to_csv(csv_path, index=False)
+        monkeypatch.setattr("src.tools.car_search.CAR_DATA_PATH", str(csv_path))
+
+        first = load_car_data()
+        assert not first.empty
+        assert car_search._read_car_data_cache(0.0) is not None
+
+        car_search._load_car_data_cached.cache_clear()
+        with patch("src.tools.car_search.pd.read_csv") as mock_read_csv:
+            second = load_car_data()
+        mock_read_csv.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_load_car_data_tolerates_missing_integers(
+        self, tmp_path, monkeypatch, sample_car_data
+    ):
+        """Test a blank integer cell falls back to inferred dtypes"""
+        csv_path = tmp_path / "cars.csv"
+        data = sample_car_data.assign(stock_id=range(5)).astype({"km": "float64"})
+        data.loc[0, "km"] = None
+        data.to_csv(csv_path, index=False)
+        monkeypatch.setattr("src.tools.car_search.CAR_DATA_PATH", str(csv_path))
+
+        df = load_car_data()
+
+        assert len(df) == 5
+        assert df["km"].isna().sum() == 1
+        assert df["stock_id"].dtype == "int64"
+        assert df["make"].dtype == "category"
+
+    def test_write_car_data_cache_is_atomic(self, tmp_path, sample_car_data):
+        """Test the cache is renamed into place and failed writes leave no files"""
+        cache_path = tmp_path / "catalog.pkl"
+
+        car_search._write_car_data_cache(sample_car_data)
+        assert [p.name for p in tmp_path.iterdir()] == ["catalog.pkl"]
+        pd.testing.assert_frame_equal(
+            car_search._read_car_data_cache(0.0), sample_car_data
+        )
+
+        before = cache_path.read_bytes()
+        with patch("src.tools.car_search.pd.to_pickle", side_effect=OSError):
+            car_search._write_car_data_cache(sample_car_data.head(1))
+        assert [p.name for p in tmp_path.iterdir()] == ["catalog.pkl"]
+        assert cache_path.read_bytes() == before
+
+    def test_cars_by_make_index_is_reused(self, sample_car_data):
+        """Test the per-make index is built once per frame and price-sorted"""
+        index = _cars_by_make(sample_car_data)
+
+        assert _cars_by_make(sample_car_data) is index
+        assert list(index["Toyota"]["model"]) == ["Corolla", "Camry"]
+        assert _cars_by_make(sample_car_data.copy()) is not index
+
+        response = _popular_cars_response(sample_car_data)
+        assert _popular_cars_response(sample_car_data) is response
+        assert "Toyota** (2 disponibles)" in response
+
+    def test_suggestions_are_ranked_by_similarity(self, sample_car_data):
+        """Test suggestions put the closest brand/model first"""
+        brands = suggest_similar_brands(sample_car_data, "Volksvagen")
+        models = suggest_similar_models(sample_car_data, "Camri")
+
+        assert brands.split(", ")[0] == "Volkswagen"
+        assert models.split(", ")[0] == "Camry"
+        assert len(models.split(", ")) == 5
+
     @patch("src.tools.car_search.pd.read_csv")
     def test_search_cars_by_budget(self, mock_read_csv, sample_car_data):
         """Test budget search with mocked data"""
@@ -204,7 +318,7 @@ class TestCarSearchTools:
 
         # Mock the car data loading with a function that returns our sample data
         def mock_load_data():
-            return pd.DataFrame(sample_data)
+            return _add_derived_columns(pd.DataFrame(sample_data))
 
         with patch("src.tools.car_search.load_car_data", side_effect=mock_load_data):
             # Test search_cars_by_budget response
@@ -2,15 +2,31 @@
 Unit tests for Kavak knowledge base and RAG implementation
 """
 
-from unittest.mock import patch, MagicMock, PropertyMock
-
-from src.knowledge.kavak_knowledge import KavakKnowledgeBase
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, AsyncMock, MagicMock, PropertyMock
+
+import numpy as np
+import pytest
+
+from src.config import settings
+from src.knowledge.kavak_knowledge import (
+    SEARCH_CACHE_TTL_S,
+    KavakKnowledgeBase,
+    ainitialize_global_kavak_kb,
+    get_embedding_function,
+    get_kavak_knowledge_base,
+)
 from src.tools.kavak_info import get_kavak_info
 
 
 class TestKavakKnowledgeBase:
     """Test Kavak knowledge base functionality"""
 
+    def setup_method(self):
+        """Drop the shared embedding function so each test sees its own mock"""
+        get_embedding_function.cache_clear()
+
     def test_kavak_knowledge_base_initialization(self):
         """Test knowledge base initialization"""
         # Create instance with default settings
@@ -83,7 +99,10 @@ class TestKavakKnowledgeBase:
                 mock_http_client.assert_called_once()
                 mock_client.heartbeat.assert_called_once()
                 mock_client.get_collection.assert_called_once()
-                mock_embedding_function.assert_called_once()
+                mock_embedding_function.assert_called_once_with(
+                    model_name=kb.embedding_model_name,
+                    model_kwargs={"use_safetensors": True},
+                )
 
                 # Verify the count method was called and returns the correct value
                 assert kb.collection.count() == mock_count
@@ -91,6 +110,62 @@ class TestKavakKnowledgeBase:
                 # Verify status through is_ready property
                 assert kb.is_ready is True
 
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_initialize_shares_embedding_function(
+        self, mock_embedding_function, mock_http_client
+    ):
+        """Test the embedding model is loaded once and shared across instances"""
+        mock_client = MagicMock()
+        mock_client.get_collection.return_value.count.return_value = 10
+        mock_http_client.return_value = mock_client
+
+        first_kb = KavakKnowledgeBase()
+        second_kb = KavakKnowledgeBase()
+        first_kb.initialize()
+        second_kb.initialize()
+
+        mock_embedding_function.assert_called_once()
+        assert first_kb.embedding_function is second_kb.embedding_function
+
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    async def test_ainitialize_success(self, mock_embedding_function, mock_http_client):
+        """Test async initialization connects and loads the model"""
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_client = MagicMock()
+        mock_client.get_collection.return_value = mock_collection
+        mock_http_client.return_value = mock_client
+
+        kb = KavakKnowledgeBase()
+        await kb.ainitialize()
+
+        mock_client.heartbeat.assert_called_once()
+        mock_embedding_function.assert_called_once()
+        assert kb.embedding_function is mock_embedding_function.return_value
+        assert kb.collection is mock_collection
+        assert kb.initialization_error is None
+
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_get_embedding_function_onnx_backend(self, mock_embedding_function):
+        """Test the ONNX backend loads the quantized export"""
+        get_embedding_function(
+            "all-MiniLM-L6-v2", "onnx", "onnx/model_qint8_avx512_vnni.onnx"
+        )
+
+        mock_embedding_function.assert_called_once_with(
+            model_name="all-MiniLM-L6-v2",
+            backend="onnx",
+            model_kwargs={"file_name": "onnx/model_qint8_avx512_vnni.onnx"},
+        )
+
     @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
     def test_initialize_collection_not_found(self, mock_http_client):
         """Test initialization with collection not found"""
@@ -154,6 +229,19 @@ class TestKavakKnowledgeBase:
         assert kb.initialization_error is not None
         assert "connection" in str(kb.initialization_error).lower()
 
+    def test_log_error_rate_limits_tracebacks(self):
+        """Test only the first of repeated errors carries a traceback"""
+        kb = KavakKnowledgeBase()
+        log_method = MagicMock()
+
+        kb._log_error(log_method, "Error: %s", "boom")
+        kb._log_error(log_method, "Error: %s", "boom")
+
+        first_call, second_call = log_method.call_args_list
+        assert first_call.kwargs == {"exc_info": True}
+        assert second_call.kwargs == {}
+        assert second_call.args == ("Error: %s", "boom")
+
     @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
     def test_search_knowledge_not_ready(self, mock_http_client):
         """Test search_knowledge when not ready"""
@@ -166,7 +254,10 @@ class TestKavakKnowledgeBase:
         assert results == []
 
     @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
-    def test_search_knowledge_success(self, mock_http_client):
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_knowledge_success(self, mock_embedding_function, mock_http_client):
         """Test successful knowledge search"""
         # Setup mocks
         mock_client = MagicMock()
@@ -181,6 +272,9 @@ class TestKavakKnowledgeBase:
             "ids": [["id1", "id2"]],
         }
         mock_client.get_collection.return_value = mock_collection
+        mock_embedding_function.return_value = MagicMock(
+            return_value=[np.array([0.1, 0.2, 0.3])]
+        )
 
         # Initialize and search
         kb = KavakKnowledgeBase()
@@ -195,15 +289,46 @@ class TestKavakKnowledgeBase:
         assert results[1]["content"] == "Document 2 content"
 
         # Verify query parameters
-        mock_collection.query.assert_called_with(
-            query_texts=["test query"],
-            n_results=2,
-            where=None,
-            include=["documents", "metadatas", "distances"],
+        call_kwargs = mock_collection.query.call_args.kwargs
+        assert len(call_kwargs["query_embeddings"]) == 1
+        assert call_kwargs["n_results"] == 2
+        assert call_kwargs["where"] is None
+        assert call_kwargs["include"] == ["documents", "metadatas", "distances"]
+
+        # The array view carries the same data without per-document dicts
+        arrays = kb.search_knowledge_arrays(
+            "test query",
+            top_k=2,
+            include=("documents", "metadatas", "distances"),
         )
+        assert arrays == {
+            "documents": ["Document 1 content", "Document 2 content"],
+            "metadatas": [{"source": "test1"}, {"source": "test2"}],
+            "distances": [0.1, 0.2],
+        }
+
+        # By default only document text is requested from Chroma
+        mock_collection.query.return_value = {
+            "documents": [["Document 1 content", "Document 2 content"]],
+            "metadatas": None,
+            "distances": None,
+            "ids": [["id1", "id2"]],
+        }
+        arrays = kb.search_knowledge_arrays("test query", top_k=2)
+        assert mock_collection.query.call_args.kwargs["include"] == ["documents"]
+        assert arrays == {
+            "documents": ["Document 1 content", "Document 2 content"],
+            "metadatas": [],
+            "distances": [],
+        }
 
     @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
-    def test_search_knowledge_with_filters(self, mock_http_client):
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_knowledge_with_filters(
+        self, mock_embedding_function, mock_http_client
+    ):
         """Test knowledge search with filters"""
         # Setup mocks
         mock_client = MagicMock()
@@ -218,6 +343,9 @@ class TestKavakKnowledgeBase:
             "ids": [["id1"]],
         }
         mock_client.get_collection.return_value = mock_collection
+        mock_embedding_function.return_value = MagicMock(
+            return_value=[np.array([0.1, 0.2, 0.3])]
+        )
 
         # Initialize and search with filters
         kb = KavakKnowledgeBase()
@@ -231,15 +359,19 @@ class TestKavakKnowledgeBase:
         assert results[0]["metadata"]["category"] == "financing"
 
         # Verify query parameters
-        mock_collection.query.assert_called_with(
-            query_texts=["test query"],
-            n_results=1,
-            where=filters,
-            include=["documents", "metadatas", "distances"],
-        )
+        call_kwargs = mock_collection.query.call_args.kwargs
+        assert len(call_kwargs["query_embeddings"]) == 1
+        assert call_kwargs["n_results"] == 1
+        assert call_kwargs["where"] == filters
+        assert call_kwargs["include"] == ["documents", "metadatas", "distances"]
 
     @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
-    def test_search_knowledge_empty_results(self, mock_http_client):
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_knowledge_empty_results(
+        self, mock_embedding_function, mock_http_client
+    ):
         """Test knowledge search with empty results"""
         # Setup mocks
         mock_client = MagicMock()
@@ -254,6 +386,9 @@ class TestKavakKnowledgeBase:
             "ids": [[]],
         }
         mock_client.get_collection.return_value = mock_collection
+        mock_embedding_function.return_value = MagicMock(
+            return_value=[np.array([0.1, 0.2, 0.3])]
+        )
 
         # Initialize and search
         kb = KavakKnowledgeBase()
@@ -263,18 +398,387 @@ class TestKavakKnowledgeBase:
         # Verify results
         assert len(results) == 0
 
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_knowledge_caches_query_embeddings(
+        self, mock_embedding_function, mock_http_client
+    ):
+        """Test repeated queries reuse the cached query embedding"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_collection.query.return_value = {
+            "documents": [["Document 1 content"]],
+            "metadatas": [[{"source": "test1"}]],
+            "distances": [[0.1]],
+            "ids": [["id1"]],
+        }
+        mock_client.get_collection.return_value = mock_collection
+
+        mock_embedding = MagicMock(return_value=[np.array([0.1, 0.2, 0.3])])
+        mock_embedding_function.return_value = mock_embedding
+
+        # Initialize and search twice with the same query
+        kb = KavakKnowledgeBase()
+        kb.initialize()
+        kb.search_knowledge("garantía", top_k=1)
+        kb.search_knowledge("garantía", top_k=2)
+
+        # The query was embedded once and passed as a precomputed vector
+        mock_embedding.assert_called_once_with(["garantía"])
+        assert mock_collection.query.call_count == 2
+        call_kwargs = mock_collection.query.call_args.kwargs
+        assert "query_texts" not in call_kwargs
+        assert call_kwargs["query_embeddings"] == [pytest.approx([0.1, 0.2, 0.3])]
+
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_knowledge_caches_normalized_queries(
+        self, mock_embedding_function, mock_http_client
+    ):
+        """Test equivalent queries are answered from the search cache"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_collection.query.return_value = {
+            "documents": [["Garantía de 3 meses"]],
+            "metadatas": [[{"category": "warranty"}]],
+            "distances": [[0.1]],
+            "ids": [["id1"]],
+        }
+        mock_client.get_collection.return_value = mock_collection
+        embed = MagicMock(return_value=[np.array([0.1, 0.2, 0.3])])
+        mock_embedding_function.return_value = embed
+
+        kb = KavakKnowledgeBase()
+        kb.initialize()
+        first = kb.search_knowledge("Garantía", top_k=1)
+        collection_lookups = mock_client.get_collection.call_count
+        count_calls = mock_collection.count.call_count
+        second = kb.search_knowledge("  garantía ", top_k=1)
+
+        assert first == second
+        assert first[0]["content"] == "Garantía de 3 meses"
+        mock_collection.query.assert_called_once()
+        assert kb.search_cache_info().hits == 1
+        # Only the cache key is normalized; the model sees the original text
+        embed.assert_called_once_with(["Garantía"])
+        # A cache hit does not touch Chroma
+        assert mock_client.get_collection.call_count == collection_lookups
+        assert mock_collection.count.call_count == count_calls
+
+        # Filtered searches bypass the cache
+        kb.search_knowledge("garantía", top_k=1, filters={"category": "warranty"})
+        assert mock_collection.query.call_count == 2
+
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_cache_cleared_when_content_hash_changes(
+        self, mock_embedding_function, mock_http_client
+    ):
+        """Test a rebuilt collection invalidates cached search results"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        old_collection = MagicMock()
+        old_collection.metadata = {"content_hash": "old"}
+        old_collection.count.return_value = 10
+        old_collection.query.return_value = {
+            "documents": [["Garantía de 3 meses"]],
+            "metadatas": [[{"category": "warranty"}]],
+            "distances": [[0.1]],
+        }
+        new_collection = MagicMock()
+        new_collection.metadata = {"content_hash": "new"}
+        new_collection.count.return_value = 10
+        new_collection.query.return_value = {
+            "documents": [["Garantía de 6 meses"]],
+            "metadatas": [[{"category": "warranty"}]],
+            "distances": [[0.1]],
+        }
+        mock_client.get_collection.return_value = old_collection
+        mock_embedding_function.return_value = MagicMock(
+            return_value=[np.array([0.1, 0.2, 0.3])]
+        )
+
+        kb = KavakKnowledgeBase()
+        kb.initialize()
+        assert kb.search_knowledge_arrays("garantía", top_k=1)["documents"] == [
+            "Garantía de 3 meses"
+        ]
+
+        # The setup script rebuilds the collection; the next miss notices it
+        mock_client.get_collection.return_value = new_collection
+        kb.search_knowledge_arrays("financiamiento", top_k=1)
+
+        assert kb.search_knowledge_arrays("garantía", top_k=1)["documents"] == [
+            "Garantía de 6 meses"
+        ]
+
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_cache_entries_expire(
+        self, mock_embedding_function, mock_http_client
+    ):
+        """Test cached search results are refetched after the TTL"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_collection.query.return_value = {
+            "documents": [["Garantía de 3 meses"]],
+            "metadatas": [[{"category": "warranty"}]],
+            "distances": [[0.1]],
+        }
+        mock_client.get_collection.return_value = mock_collection
+        mock_embedding_function.return_value = MagicMock(
+            return_value=[np.array([0.1, 0.2, 0.3])]
+        )
+
+        kb = KavakKnowledgeBase()
+        kb.initialize()
+        with patch("src.knowledge.kavak_knowledge.time.monotonic") as mock_clock:
+            mock_clock.return_value = 1000.0
+            kb.search_knowledge_arrays("garantía", top_k=1)
+            mock_clock.return_value = 1000.0 + SEARCH_CACHE_TTL_S + 1
+            kb.search_knowledge_arrays("garantía", top_k=1)
+
+        assert mock_collection.query.call_count == 2
+
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_warmup_runs_one_search(self, mock_embedding_function, mock_http_client):
+        """Test warmup embeds and searches once so the first user hits the cache"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_collection.query.return_value = {
+            "documents": [["Kavak es una plataforma de autos seminuevos"]],
+            "metadatas": [[{"category": "general"}]],
+            "distances": [[0.1]],
+            "ids": [["id1"]],
+        }
+        mock_client.get_collection.return_value = mock_collection
+        mock_embedding = MagicMock(return_value=[np.array([0.1, 0.2, 0.3])])
+        mock_embedding_function.return_value = mock_embedding
+
+        kb = KavakKnowledgeBase()
+        kb.initialize()
+        kb.warmup()
+
+        mock_embedding.assert_called_once_with(["kavak"])
+        mock_collection.query.assert_called_once()
+
+        kb.search_knowledge_arrays("Kavak", top_k=1)
+        mock_collection.query.assert_called_once()
+
+    def test_warmup_skips_when_not_ready(self):
+        """Test warmup is a no-op when the knowledge base is not ready"""
+        kb = KavakKnowledgeBase()
+        kb.search_knowledge_arrays = MagicMock()
+
+        kb.warmup()
+
+        kb.search_knowledge_arrays.assert_not_called()
+
+    @patch("src.knowledge.kavak_knowledge.get_reranker")
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    def test_search_knowledge_reranks_oversampled_candidates(
+        self, mock_embedding_function, mock_http_client, mock_get_reranker
+    ):
+        """Test the cross-encoder reorders oversampled candidates when enabled"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_collection.query.return_value = {
+            "documents": [["Doc A", "Doc B", "Doc C"]],
+            "metadatas": [[{"id": "a"}, {"id": "b"}, {"id": "c"}]],
+            "distances": [[0.1, 0.2, 0.3]],
+            "ids": [["a", "b", "c"]],
+        }
+        mock_client.get_collection.return_value = mock_collection
+        mock_embedding_function.return_value = MagicMock(
+            return_value=[np.array([0.1, 0.2, 0.3])]
+        )
+        mock_reranker = MagicMock()
+        mock_reranker.predict.return_value = np.array([0.1, 0.9, 0.5])
+        mock_get_reranker.return_value = mock_reranker
+
+        with patch.object(settings.chroma, "RERANKER_ENABLED", True):
+            kb = KavakKnowledgeBase()
+        kb.initialize()
+        results = kb.search_knowledge("garantía", top_k=2)
+
+        # Candidates are oversampled, then ordered by cross-encoder score
+        assert mock_collection.query.call_args.kwargs["n_results"] == (
+            kb.reranker_candidates
+        )
+        mock_reranker.predict.assert_called_once_with(
+            [("garantía", "Doc A"), ("garantía", "Doc B"), ("garantía", "Doc C")]
+        )
+        assert [r["content"] for r in results] == ["Doc B", "Doc C"]
+        assert [r["distance"] for r in results] == [0.2, 0.3]
+
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    async def test_asearch_knowledge_batches_concurrent_queries(
+        self, mock_embedding_function, mock_http_client
+    ):
+        """Test concurrent async searches are coalesced into one query call"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_collection.query.return_value = {
+            "documents": [["Garantía doc"], ["Financiamiento doc"]],
+            "metadatas": [[{"source": "warranty"}], [{"source": "financing"}]],
+            "distances": [[0.1], [0.2]],
+            "ids": [["id1"], ["id2"]],
+        }
+        mock_client.get_collection.return_value = mock_collection
+
+        mock_embedding = MagicMock(
+            side_effect=lambda texts: [np.array([float(len(t))]) for t in texts]
+        )
+        mock_embedding_function.return_value = mock_embedding
+
+        # Initialize and search concurrently
+        kb = KavakKnowledgeBase()
+        kb.initialize()
+        first, second = await asyncio.gather(
+            kb.asearch_knowledge("garantía", top_k=1),
+            kb.asearch_knowledge("financiamiento", top_k=1),
+        )
+
+        # Each caller gets its own slice of the batched result
+        assert first[0]["content"] == "Garantía doc"
+        assert first[0]["metadata"]["source"] == "warranty"
+        assert second[0]["content"] == "Financiamiento doc"
+        assert second[0]["distance"] == 0.2
+
+        # Both queries were embedded together and went out in a single call
+        mock_embedding.assert_called_once_with(["garantía", "financiamiento"])
+        mock_collection.query.assert_called_once_with(
+            query_embeddings=[[8.0], [14.0]],
+            n_results=1,
+            where=None,
+            include=["documents", "metadatas", "distances"],
+        )
+
+    @patch("src.knowledge.kavak_knowledge.chromadb.HttpClient")
+    @patch(
+        "src.knowledge.kavak_knowledge.embedding_functions.SentenceTransformerEmbeddingFunction"
+    )
+    async def test_asearch_knowledge_arrays_uses_search_cache(
+        self, mock_embedding_function, mock_http_client
+    ):
+        """Test the async path fetches only documents and reuses cached results"""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_http_client.return_value = mock_client
+
+        mock_collection = MagicMock()
+        mock_collection.count.return_value = 10
+        mock_collection.query.return_value = {"documents": [["Garantía doc"]]}
+        mock_client.get_collection.return_value = mock_collection
+        mock_embedding_function.return_value = MagicMock(
+            return_value=[np.array([0.1, 0.2, 0.3])]
+        )
+
+        kb = KavakKnowledgeBase()
+        kb.initialize()
+        first = await kb.asearch_knowledge_arrays("Garantía", top_k=1)
+        collection_lookups = mock_client.get_collection.call_count
+        second = await kb.asearch_knowledge_arrays("garantía", top_k=1)
+
+        assert first == second
+        assert first["documents"] == ["Garantía doc"]
+        mock_collection.query.assert_called_once_with(
+            query_embeddings=[[0.1, 0.2, 0.3]],
+            n_results=1,
+            where=None,
+            include=["documents"],
+        )
+        # The cache hit skipped the readiness check, and the sync path shares it
+        assert mock_client.get_collection.call_count == collection_lookups
+        assert kb.search_knowledge_arrays("garantía", top_k=1) == first
+        assert kb.search_cache_info().hits == 2
+
+    @patch("src.knowledge.kavak_knowledge.kavak_kb_instance", None)
+    @patch.object(KavakKnowledgeBase, "initialize")
+    def test_initialize_global_kavak_kb_runs_once_across_threads(self, mock_initialize):
+        """Test concurrent first access initializes a single instance"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = list(
+                executor.map(lambda _: get_kavak_knowledge_base(), range(8))
+            )
+
+        mock_initialize.assert_called_once()
+        assert all(instance is instances[0] for instance in instances)
+
+    @patch("src.knowledge.kavak_knowledge.kavak_kb_instance", None)
+    @patch.object(KavakKnowledgeBase, "ainitialize")
+    async def test_ainitialize_global_kavak_kb_runs_once_across_tasks(
+        self, mock_ainitialize
+    ):
+        """Test concurrent async first calls initialize a single instance"""
+
+        async def slow_init():
+            await asyncio.sleep(0.01)
+
+        mock_ainitialize.side_effect = slow_init
+
+        instances = await asyncio.gather(
+            *(ainitialize_global_kavak_kb() for _ in range(8))
+        )
+
+        mock_ainitialize.assert_called_once()
+        assert all(instance is instances[0] for instance in instances)
+
     def test_get_kavak_info_tool(self):
         """Test get_kavak_info tool"""
         # Setup mock KB
         mock_kb = MagicMock()
         mock_kb.is_ready = True
-        mock_kb.search_knowledge.return_value = [
-            {
-                "content": "Kavak es una plataforma de compra y venta de autos seminuevos.",
-                "metadata": {"category": "general"},
-                "distance": 0.1,
-            }
-        ]
+        mock_kb.search_knowledge_arrays.return_value = {
+            "documents": [
+                "Kavak es una plataforma de compra y venta de autos seminuevos."
+            ],
+            "metadatas": [{"category": "general"}],
+            "distances": [0.1],
+        }
         mock_kb.get_status.return_value = "Ready"
 
         # Patch the global knowledge base
@@ -286,7 +790,7 @@ class TestKavakKnowledgeBase:
             assert "Kavak" in result
             assert "plataforma" in result.lower()
             assert "autos" in result.lower()
-            mock_kb.search_knowledge.assert_called_once_with(
+            mock_kb.search_knowledge_arrays.assert_called_once_with(
                 query="¿Qué es Kavak?", top_k=1
             )
 
@@ -316,7 +820,7 @@ class TestKavakKnowledgeBase:
             )
             or "🤔" in result
         )
-        assert not mock_kb.search_knowledge.called
+        assert not mock_kb.search_knowledge_arrays.called
 
     @patch("src.knowledge.kavak_knowledge.get_kavak_knowledge_base")
     def test_get_kavak_info_tool_empty_results(self, mock_get_kb):
@@ -324,7 +828,11 @@ class TestKavakKnowledgeBase:
         # Setup mock KB with empty results
         mock_kb = MagicMock()
         mock_kb.is_ready = True
-        mock_kb.search_knowledge.return_value = []
+        mock_kb.search_knowledge_arrays.return_value = {
+            "documents": [],
+            "metadatas": [],
+            "distances": [],
+        }
         mock_kb.get_status.return_value = "Ready"
         mock_get_kb.return_value = mock_kb
 
@@ -342,13 +850,11 @@ class TestKavakKnowledgeBase:
         # Setup mock KB with long content
         mock_kb = MagicMock()
         mock_kb.is_ready = True
-        mock_kb.search_knowledge.return_value = [
-            {
-                "content": long_content,
-                "metadata": {"category": "general"},
-                "distance": 0.1,
-            }
-        ]
+        mock_kb.search_knowledge_arrays.return_value = {
+            "documents": [long_content],
+            "metadatas": [{"category": "general"}],
+            "distances": [0.1],
+        }
         mock_kb.get_status.return_value = "Ready"
 
         # Patch the global knowledge base
@@ -367,3 +873,27 @@ class TestKavakKnowledgeBase:
                     "información",
                 ]
             )
+
+    async def test_get_kavak_info_tool_async_uses_batched_search(self):
+        """Test ainvoke goes through the batched async search"""
+        mock_kb = MagicMock()
+        is_ready = PropertyMock(return_value=True)
+        type(mock_kb).is_ready = is_ready
+        mock_kb.asearch_knowledge_arrays = AsyncMock(
+            return_value={
+                "documents": ["Kavak ofrece garantía de 3 meses o 3,000 km."],
+                "metadatas": [],
+                "distances": [],
+            }
+        )
+
+        with patch("src.knowledge.kavak_knowledge.kavak_kb_instance", mock_kb):
+            result = await get_kavak_info.ainvoke({"query": "¿Qué garantía dan?"})
+
+        assert result == "Kavak ofrece garantía de 3 meses o 3,000 km."
+        mock_kb.asearch_knowledge_arrays.assert_awaited_once_with(
+            "¿Qué garantía dan?", top_k=1
+        )
+        assert not mock_kb.search_knowledge_arrays.called
+        # Readiness is left to the search itself, which checks it on a miss
+        assert not is_ready.called
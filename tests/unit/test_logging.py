@@ -0,0 +1,63 @@
+"""
+Unit tests for logging configuration
+"""
+
+import logging
+import logging.handlers
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.config import settings
+from src.core.logging import get_logger, setup_logging
+
+
+@pytest.fixture
+def isolated_root_logger(tmp_path, monkeypatch):
+    """Run setup_logging against a temp log dir and restore the root logger"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    monkeypatch.setattr("src.core.logging._logging_initialized", False)
+    monkeypatch.setattr(settings.logging, "LOG_DIR", str(tmp_path / "logs"))
+    yield tmp_path / "logs"
+    for handler in root.handlers[:]:
+        if handler not in saved_handlers:
+            handler.close()
+            root.removeHandler(handler)
+    for handler in saved_handlers:
+        if handler not in root.handlers:
+            root.addHandler(handler)
+    root.setLevel(saved_level)
+
+
+class TestLoggingSetup:
+    """Test logging handler wiring"""
+
+    def test_import_does_not_configure_logging(self, tmp_path):
+        """Test importing the module and getting a logger leaves handlers alone"""
+        repo_root = Path(__file__).resolve().parents[2]
+        code = (
+            "import logging, sys; sys.path.insert(0, sys.argv[1]);"
+            "from src.core.logging import get_logger;"
+            "get_logger('x');"
+            "assert not logging.getLogger().handlers"
+        )
+        subprocess.run(
+            [sys.executable, "-c", code, str(repo_root)], cwd=tmp_path, check=True
+        )
+
+        assert not (tmp_path / "logs").exists()
+
+    def test_setup_logging_installs_rotating_file_handler(self, isolated_root_logger):
+        """Test setup_logging configures the root logger with file rotation"""
+        setup_logging()
+        logger = get_logger(__name__)
+
+        assert logger.name == __name__
+        assert any(
+            isinstance(handler, logging.handlers.RotatingFileHandler)
+            for handler in logging.getLogger().handlers
+        )
+        assert (isolated_root_logger / settings.logging.LOG_FILE).exists()
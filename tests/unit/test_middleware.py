@@ -0,0 +1,68 @@
+"""
+Unit tests for application middlewares
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.middleware import FastCORSMiddleware
+
+
+class TestFastCORSMiddleware:
+    """Test the pure-ASGI CORS middleware"""
+
+    @pytest.fixture
+    def client(self):
+        """Fixture for an app restricted to a single origin"""
+        app = FastAPI()
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        app.add_middleware(
+            FastCORSMiddleware,
+            allow_origins=["https://kavak.com"],
+            allow_methods=["GET", "POST"],
+            allow_headers=["Content-Type"],
+        )
+        return TestClient(app)
+
+    def test_simple_request_gets_cors_headers(self, client):
+        """Test allowed origins are echoed on regular responses"""
+        response = client.get("/ping", headers={"Origin": "https://kavak.com"})
+
+        assert response.status_code == 200
+        assert response.json() == {"ok": True}
+        assert response.headers["access-control-allow-origin"] == "https://kavak.com"
+        assert response.headers["access-control-allow-credentials"] == "true"
+
+    def test_disallowed_origin_gets_no_cors_headers(self, client):
+        """Test unknown origins pass through without CORS headers"""
+        response = client.get("/ping", headers={"Origin": "https://evil.example"})
+
+        assert response.status_code == 200
+        assert "access-control-allow-origin" not in response.headers
+
+    def test_preflight_short_circuits(self, client):
+        """Test preflight requests are answered by the middleware"""
+        response = client.options(
+            "/ping",
+            headers={
+                "Origin": "https://kavak.com",
+                "Access-Control-Request-Method": "POST",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-methods"] == "GET, POST"
+        assert response.headers["access-control-allow-headers"] == "content-type"
+
+        response = client.options(
+            "/ping",
+            headers={
+                "Origin": "https://kavak.com",
+                "Access-Control-Request-Method": "DELETE",
+            },
+        )
+        assert response.status_code == 400
@@ -60,17 +60,20 @@ class TestRedisConversationMemory:
         # Call save method
         result = memory.save_conversation(session_id, conversation)
 
-        # Verify Redis setex was called with correct parameters
-        assert mock_client.setex.call_count == 2
+        # Verify both writes went through a single pipeline
+        mock_client.pipeline.assert_called_once_with(transaction=False)
+        mock_pipe = mock_client.pipeline.return_value
+        mock_pipe.execute.assert_called_once()
+        assert mock_pipe.setex.call_count == 2
 
         # Get the first call arguments (conversation data)
-        first_call = mock_client.setex.call_args_list[0][0]
+        first_call = mock_pipe.setex.call_args_list[0][0]
         assert first_call[0] == "kavak:conversation:test_session"
         assert first_call[1] == 86400  # Default TTL
         assert json.loads(first_call[2]) == conversation
 
         # Get the second call arguments (activity timestamp)
-        second_call = mock_client.setex.call_args_list[1][0]
+        second_call = mock_pipe.setex.call_args_list[1][0]
         assert second_call[0] == "kavak:activity:test_session"
         assert second_call[1] == 86400  # Default TTL
         assert isinstance(second_call[2], int)  # Timestamp
@@ -164,26 +167,33 @@ class TestRedisConversationMemory:
         memory.is_connected = True
         memory.redis_client = mock_client
 
-        # Mock Redis keys to return session keys
-        mock_client.keys.return_value = [
-            "kavak:conversation:session1",
-            "kavak:conversation:session2",
-        ]
-
-        # Mock get_conversation to return test data
-        memory.get_conversation = MagicMock(
-            return_value=[{"user": "test", "agent": "test"}]
+        # Mock Redis scan to return session keys
+        mock_client.scan_iter.return_value = iter(
+            [
+                "kavak:conversation:session1",
+                "kavak:conversation:session2",
+            ]
         )
 
-        # Mock ttl and get for activity
-        mock_client.ttl.return_value = 3600
-        mock_client.get.return_value = "1621234567"
+        # Mock pipelined conversation, ttl and activity replies per session
+        conversation = json.dumps([{"user": "test", "agent": "test"}])
+        mock_client.pipeline.return_value.execute.return_value = [
+            conversation,
+            3600,
+            "1621234567",
+            conversation,
+            1800,
+            None,
+        ]
 
         # Call list method
         result = memory.list_active_sessions()
 
-        # Verify Redis keys was called with correct pattern
-        mock_client.keys.assert_called_once_with("kavak:conversation:*")
+        # Verify Redis scan was called with correct pattern
+        mock_client.scan_iter.assert_called_once_with(
+            match="kavak:conversation:*", count=100
+        )
+        mock_client.keys.assert_not_called()
 
         # Verify result contains expected sessions
         assert "session1" in result
@@ -191,6 +201,9 @@ class TestRedisConversationMemory:
         assert result["session1"]["message_count"] == 1
         assert result["session1"]["ttl_seconds"] == 3600
         assert result["session1"]["last_activity"] == 1621234567
+        assert result["session1"]["last_message"] == "test"
+        assert result["session2"]["ttl_seconds"] == 1800
+        assert result["session2"]["last_activity"] == 0
 
     @patch("src.agent.redis_memory.redis.from_url")
     def test_redis_error_handling(self, mock_redis):